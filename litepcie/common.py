@@ -45,7 +45,9 @@ def request_layout(data_width, address_width=32):
         ("we",               1), # Request type; 0 : Read / 1 : Write.
         ("adr",  address_width), # Request address (In Bytes).
         ("len",             10), # Request length (In Dwords).
-        ("tag",              8), # Request tag.
+        ("tag",             10), # Request tag (8-bit or 10-bit).
+        ("first_be",         4), # Request first Dword Byte Enables (0: Legacy, all bytes enabled).
+        ("last_be",          4), # Request last  Dword Byte Enables (Only used when first_be != 0).
 
         # Data Stream.
         ("dat", data_width),
@@ -65,7 +67,7 @@ def completion_layout(data_width, address_width=32):
         ("len",             10), # Completion length (In Dwords).
         ("end",              1), # Completion end (Current packet is the last).
         ("err",              1), # Completion error.
-        ("tag",              8), # Completion tag.
+        ("tag",             10), # Completion tag (8-bit or 10-bit).
 
         # Data Stream.
         ("dat",     data_width),
@@ -80,5 +82,8 @@ def msi_layout():
     return [("dat", 8)]
 
 def dma_layout(data_width):
-    layout = [("data", data_width)]
+    layout = [
+        ("data", data_width),
+        ("keep", data_width//8), # Bytes valid (on last data-word, 0: Legacy, all bytes valid).
+    ]
     return EndpointDescription(layout)
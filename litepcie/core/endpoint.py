@@ -18,6 +18,7 @@ class LitePCIeEndpoint(Module):
     def __init__(self, phy, max_pending_requests=4, address_width=32, endianness="big", cmp_bufs_buffered=True):
         self.phy                  = phy
         self.max_pending_requests = max_pending_requests
+        self.endianness           = endianness
 
         # # #
 
@@ -15,12 +15,50 @@ from litepcie.tlp.common import *
 
 # Constants/Layouts --------------------------------------------------------------------------------
 
-def descriptor_layout(address_width=32, with_user_id=False):
-    layout = [("address", address_width), ("length",  24), ("irq_disable", 1), ("last_disable", 1)]
+def descriptor_layout(address_width=32, with_user_id=False, length_width=32):
+    layout = [("address", address_width), ("length",  length_width), ("irq_disable", 1), ("last_disable", 1)]
     if with_user_id:
         layout += [("user_id", 8)]
     return EndpointDescription(layout)
 
+# Helpers ------------------------------------------------------------------------------------------
+
+def request_byte_enables(request, length):
+    """Byte Enables of a Request of length bytes (from a Dword-aligned address)."""
+    last_be = Signal(4)
+    return [
+        Case(length[:2], {
+            0b00: last_be.eq(0b1111),
+            0b01: last_be.eq(0b0001),
+            0b10: last_be.eq(0b0011),
+            0b11: last_be.eq(0b0111),
+        }),
+        # Single Dword Request: Byte Enables on first_be.
+        If(length <= 4,
+            request.first_be.eq(last_be),
+            request.last_be.eq(0b0000),
+        # Multiple Dwords Request.
+        ).Else(
+            request.first_be.eq(0b1111),
+            request.last_be.eq(last_be),
+        )
+    ]
+
+def last_word_keep(keep, length, data_width, endianness):
+    """Bytes valid on the last data-word of length bytes."""
+    length_shift = log2_int(data_width//8)
+    _keep        = Signal(data_width//8)
+    return [
+        Case(length[:length_shift], {
+            n: _keep.eq(2**(n if n else data_width//8) - 1) for n in range(data_width//8)
+        }),
+        # Bytes are swapped in the Dwords with big endianness.
+        keep.eq({
+            "little" : _keep,
+            "big"    : Cat(*[reverse_bits(_keep[4*n:4*(n+1)]) for n in range(data_width//32)]),
+        }[endianness])
+    ]
+
 
 # LitePCIeDMAScatterGather --------------------------------------------------------------------------
 
@@ -49,8 +87,16 @@ class LitePCIeDMAScatterGather(Module, AutoCSR):
     - a 24-bit length : The length of the data stream (bytes).
     - a 8-bit control : Dynamic controls (ex: Disable IRQ generation, disable Last handling).
 
+    With length_width=32, the Extended descriptor format is used: The length is 32-bit and the
+    controls are moved to a third 32-bit word of the value CSR (bit 0: IRQ Disable, bit 1: Last
+    Disable).
+
     The table is implemented as a FIFO initially filled by software. Once enabled, the DMA gets the
-    descriptors from this table and executes them.
+    descriptors from this table and executes them. Deep tables (> 256 descriptors) are implemented
+    in Block RAM (buffered FIFO) to avoid the LUT usage of distributed RAM.
+
+    With with_sink, descriptors can also be written to the table (in Prog mode) from a sink, ex from
+    a LitePCIeDMADescriptorDoorbell.
 
     This module has two modes:
     - Prog mode: Used to program the table by software and for cases where automatic refill of the
@@ -64,18 +110,22 @@ class LitePCIeDMAScatterGather(Module, AutoCSR):
     potentially be lost, it's safer for the software to just use the hardware loop status than to
     maintain a software loop status based MSI IRQ reception).
     """
-    def __init__(self, depth, address_width=32):
+    def __init__(self, depth, address_width=32, length_width=24, with_sink=False):
         assert address_width in [32, 64]
-        # Stream Endpoint.
+        assert length_width  in [24, 32]
+        # Stream Endpoints.
         self.source = source = stream.Endpoint(descriptor_layout(address_width=address_width))
+        if with_sink:
+            self.sink = sink = stream.Endpoint(descriptor_layout(address_width=address_width))
 
         # Control/Status.
-        self.value = CSRStorage(64, reset_less=True, fields=[
-            CSRField("address_lsb",  size=32, description="32-bit LSB Address of the descriptor (bytes-aligned)."),
-            CSRField("length",       size=24, description="24-bit Length  of the descriptor (in bytes)."),
-            CSRField("irq_disable",  size=1,  description="IRQ Disable Control of the descriptor."),
-            CSRField("last_disable", size=1,  description="Last Disable Control of the descriptor.")
-            ], description="64-bit DMA descriptor to be written to the table.")
+        value_size = {24: 64, 32: 96}[length_width]
+        self.value = CSRStorage(value_size, reset_less=True, fields=[
+            CSRField("address_lsb",  size=32,           description="32-bit LSB Address of the descriptor (bytes-aligned)."),
+            CSRField("length",       size=length_width, description=f"{length_width}-bit Length of the descriptor (in bytes)."),
+            CSRField("irq_disable",  size=1,            description="IRQ Disable Control of the descriptor."),
+            CSRField("last_disable", size=1,            description="Last Disable Control of the descriptor.")
+            ], description=f"{value_size}-bit DMA descriptor to be written to the table.")
         self.we = CSRStorage(32, description="Write and 32-bit MSB Address of the descriptor (bytes-aligned)", fields=[
             CSRField("address_msb", size=32, description="32-bit MSB Address of the descriptor (bytes-aligned), in 64-bit mode."),
         ])
@@ -88,9 +138,10 @@ class LitePCIeDMAScatterGather(Module, AutoCSR):
             **Loop** mode should be used once the table has been filled by software in **Prog** mode
             and allow continuous Scatter-Gather DMA: Each descriptor sent to the DMA is refilled to the table.
             """)
+        index_size = max(16, bits_for(depth - 1))
         self.loop_status = CSRStatus(fields=[
-            CSRField("index", size=16, description= "Index of the last descriptor executed in the DMA descriptor table."),
-            CSRField("count", size=16, description= "Loops of the DMA descriptor table since started."),
+            CSRField("index", size=index_size, description= "Index of the last descriptor executed in the DMA descriptor table."),
+            CSRField("count", size=16,         description= "Loops of the DMA descriptor table since started."),
             ], description="Loop monitoring for software synchronization.")
         self.level = CSRStatus(bits_for(depth), description="Number descriptors in the table.")
         self.reset = CSRStorage(description="A write to this register resets the table.")
@@ -98,7 +149,11 @@ class LitePCIeDMAScatterGather(Module, AutoCSR):
         # # #
 
         # Table (FIFO) -----------------------------------------------------------------------------
-        table = stream.SyncFIFO(descriptor_layout(address_width=address_width), depth)
+        table = stream.SyncFIFO(
+            layout   = descriptor_layout(address_width=address_width, length_width=length_width),
+            depth    = depth,
+            buffered = depth > 256, # Block RAM for deep tables.
+        )
         table = ResetInserter()(table)
         self.submodules += table
         self.comb += table.reset.eq(self.reset.storage & self.reset.re)
@@ -113,9 +168,18 @@ class LitePCIeDMAScatterGather(Module, AutoCSR):
             return address_map
 
         prog_mode = (self.loop_prog_n.storage == 0)
+        # In Prog mode, the Table can also be filled from the Sink (when not filled through the CSRs).
+        sink_prog = Signal()
+        if with_sink:
+            self.comb += sink.ready.eq(prog_mode & ~self.we.re)
+            self.comb += sink_prog.eq(sink.valid & sink.ready)
         self.sync += [
-            # In Prog mode, the Table is filled through the CSRs.
-            If(prog_mode,
+            # In Prog mode, the Table is filled through the CSRs or the Sink.
+            If(prog_mode & sink_prog,
+                sink.connect(table.sink, omit={"valid", "ready", "first", "last"}) if with_sink else [],
+                table.sink.first.eq((table.level == 0) & ~table.sink.valid), # Back-to-back writes.
+                table.sink.valid.eq(1),
+            ).Elif(prog_mode,
                 *table_sink_address_map(),
                 table.sink.length.eq(self.value.fields.length),
                 table.sink.irq_disable.eq(self.value.fields.irq_disable),
@@ -157,6 +221,336 @@ class LitePCIeDMAScatterGather(Module, AutoCSR):
             )
         ]
 
+# LitePCIeDMADescriptorRing ------------------------------------------------------------------------
+
+descriptor_ring_entry_size = 16 # In bytes.
+
+class LitePCIeDMADescriptorRing(Module, AutoCSR):
+    """LitePCIe DMA Descriptor Ring
+
+    Descriptor ring stored in Host's memory and fetched by the DMA.
+
+                      Head (Doorbell)
+                            │
+                         ┌──▼──┐    ┌────────────┐    ┌──────────────┐
+      Ring (Host) ◄──────┤Fetch├────►  Converter ├────►  Descriptors ├───► Descriptor (To DMA).
+                  Reads  └─────┘    │ (to 128b)  │    │    (FIFO)    │
+                                    └────────────┘    └──────────────┘
+
+    Alternative to LitePCIeDMAScatterGather where software only has to write the descriptors to a
+    ring in Host's memory and then update the Head index (Doorbell). The descriptors between the
+    Tail and the Head are fetched with DMA Reads (batched up to the Maximum Request Size) and
+    queued to the DMA.
+
+    A ring entry is composed of 4 x 32-bit words (16 bytes):
+    0: 32-bit LSB Address of the descriptor (bytes-aligned).
+    1: 24-bit Length of the descriptor (in bytes) + Controls (same layout than the MSB of the
+       LitePCIeDMAScatterGather's value CSR: bit 24: IRQ Disable, bit 25: Last Disable).
+    2: 32-bit MSB Address of the descriptor (bytes-aligned), in 64-bit mode.
+    3: Reserved.
+
+    With length_width=32 (Extended descriptor format), word 1 is the 32-bit Length and the Controls
+    are moved to word 3 (bit 0: IRQ Disable, bit 1: Last Disable).
+
+    The ring base address has to be 16-bytes aligned and the ring size has to be a power of 2. The
+    Tail index is the index of the next entry to be received: Entries before the Tail have been
+    copied to the FPGA and can be reused by software. The ring is empty when Head == Tail, so at
+    most size - 1 entries can be queued.
+    """
+    def __init__(self, endpoint, port, address_width=32, length_width=24, depth=64, max_pending_fetches=4):
+        assert address_width in [32, 64]
+        assert length_width  in [24, 32]
+        assert depth >= max_request_size//descriptor_ring_entry_size
+        self.port = port
+        # Stream Endpoint.
+        self.source = source = stream.Endpoint(descriptor_layout(address_width=address_width))
+
+        # Control/Status.
+        self.address_lsb = CSRStorage(32, description="Ring Base Address (LSB) on Host (16-bytes aligned).")
+        self.address_msb = CSRStorage(32, description="Ring Base Address (MSB) on Host.")
+        self.size        = CSRStorage(32, reset=2**16, description="Ring Size (in descriptors, power of 2, up to 65536).")
+        self.head        = CSRStorage(16, description="Ring Head index (Doorbell): Index of the next descriptor written by software.")
+        self.tail        = CSRStatus(16,  description="Ring Tail index: Index of the next descriptor to be received by the DMA (Entries before Tail can be reused by software).")
+        self.level       = CSRStatus(bits_for(depth), description="Number of fetched descriptors waiting to be executed.")
+        self.reset       = CSRStorage(description="A write to this register resets the ring (DMA has to be disabled).")
+
+        # # #
+
+        data_width = endpoint.phy.data_width
+        entry_bits = 8*descriptor_ring_entry_size
+
+        # Descriptors FIFO -------------------------------------------------------------------------
+        desc_fifo = stream.SyncFIFO(descriptor_layout(address_width=address_width), depth, buffered=True)
+        desc_fifo = ResetInserter()(desc_fifo)
+        self.submodules.desc_fifo = desc_fifo
+        self.comb += desc_fifo.reset.eq(self.reset.storage & self.reset.re)
+        self.comb += desc_fifo.source.connect(source)
+        self.comb += self.level.status.eq(desc_fifo.level)
+
+        # Fetches queue ----------------------------------------------------------------------------
+        # Store the number of descriptors requested by each fetch, used to drop the unused part of
+        # the last data-word of a fetch.
+        fetch_queue = stream.SyncFIFO([("count", 16)], max_pending_fetches)
+        self.submodules.fetch_queue = fetch_queue
+
+        # Fetch logic ------------------------------------------------------------------------------
+        size_mask = Signal(16)
+        index     = Signal(16) # Index of the next descriptor to fetch.
+        tail      = Signal(16) # Index of the next descriptor to receive.
+        reserved  = Signal(max=depth + 1)
+        self.comb += size_mask.eq(self.size.storage - 1)
+        self.comb += self.tail.status.eq(tail)
+
+        # Number of descriptors to fetch: Min of available descriptors, descriptors before wrap,
+        # descriptors per Maximum Request Size and free space in the descriptors FIFO.
+        available = Signal(16)
+        to_wrap   = Signal(17)
+        per_req   = Signal(16)
+        free      = Signal(max=depth + 1)
+        count_0   = Signal(17)
+        count_1   = Signal(17)
+        count     = Signal(17)
+        self.comb += [
+            available.eq((self.head.storage - index) & size_mask),
+            to_wrap.eq(self.size.storage - index),
+            per_req.eq(endpoint.phy.max_request_size[log2_int(descriptor_ring_entry_size):]),
+            free.eq(depth - reserved),
+            count_0.eq(Mux(available < to_wrap, available, to_wrap)),
+            count_1.eq(Mux(count_0   < per_req, count_0,   per_req)),
+            count.eq(  Mux(count_1   < free,    count_1,   free)),
+        ]
+
+        fetch_count = Signal(16)
+        fetch_done  = Signal()
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            NextValue(fetch_count, count),
+            # Wait for descriptors to fetch and space in the fetches queue.
+            If((count != 0) & fetch_queue.sink.ready,
+                NextState("FETCH")
+            )
+        )
+        # Fetch Data-Path.
+        self.comb += [
+            port.source.channel.eq(port.channel),
+            port.source.user_id.eq(0),
+            port.source.first.eq(1),
+            port.source.last.eq(1),
+            port.source.we.eq(0),
+            port.source.adr.eq(Cat(self.address_lsb.storage, self.address_msb.storage) +
+                (index << log2_int(descriptor_ring_entry_size))),
+            port.source.len.eq(fetch_count << log2_int(descriptor_ring_entry_size//4)),
+            port.source.req_id.eq(endpoint.phy.id),
+            port.source.dat.eq(0),
+            fetch_queue.sink.count.eq(fetch_count),
+        ]
+        fsm.act("FETCH",
+            # Fetch Control-Path.
+            port.source.valid.eq(1),
+            # When Fetch is accepted...
+            If(port.source.ready,
+                # Queue Fetch.
+                fetch_queue.sink.valid.eq(1),
+                fetch_done.eq(1),
+                # Return to Idle.
+                NextState("IDLE")
+            )
+        )
+
+        # Update Index/Tail/Reserved descriptors.
+        fetch_received   = Signal()
+        reserved_queue   = Signal.like(reserved)
+        reserved_dequeue = Signal()
+        self.comb += [
+            If(fetch_done, reserved_queue.eq(fetch_count)),
+            reserved_dequeue.eq(desc_fifo.source.valid & desc_fifo.source.ready),
+        ]
+        self.sync += [
+            If(desc_fifo.reset,
+                index.eq(0),
+                tail.eq(0),
+                reserved.eq(0),
+            ).Else(
+                If(fetch_done,     index.eq((index + fetch_count) & size_mask)),
+                If(fetch_received, tail.eq((tail + fetch_queue.source.count) & size_mask)),
+                reserved.eq(reserved + reserved_queue - reserved_dequeue),
+            )
+        ]
+
+        # Descriptors Decode -----------------------------------------------------------------------
+        converter = stream.Converter(data_width, entry_bits)
+        self.submodules.converter = converter
+        self.comb += [
+            converter.sink.valid.eq(port.sink.valid),
+            port.sink.ready.eq(converter.sink.ready),
+            converter.sink.last.eq(port.sink.last & port.sink.end),
+            converter.sink.data.eq(port.sink.dat),
+        ]
+
+        entry    = converter.source.data
+        received = Signal(16)
+        self.comb += desc_fifo.sink.address[0:32].eq(entry[0*32:1*32])
+        if length_width == 24:
+            self.comb += [
+                desc_fifo.sink.length.eq(       entry[1*32:1*32+24]),
+                desc_fifo.sink.irq_disable.eq(  entry[1*32+24]),
+                desc_fifo.sink.last_disable.eq( entry[1*32+25]),
+            ]
+        else:
+            self.comb += [
+                desc_fifo.sink.length.eq(       entry[1*32:2*32]),
+                desc_fifo.sink.irq_disable.eq(  entry[3*32+0]),
+                desc_fifo.sink.last_disable.eq( entry[3*32+1]),
+            ]
+        if address_width == 64:
+            self.comb += desc_fifo.sink.address[32:64].eq(entry[2*32:3*32])
+        self.comb += [
+            # Only keep the requested descriptors (Drop unused part of last data-word).
+            desc_fifo.sink.valid.eq(converter.source.valid & (received < fetch_queue.source.count)),
+            converter.source.ready.eq(desc_fifo.sink.ready | (received >= fetch_queue.source.count)),
+            # Dequeue Fetch on last data-word.
+            fetch_received.eq(converter.source.valid & converter.source.ready & converter.source.last),
+            fetch_queue.source.ready.eq(fetch_received),
+        ]
+        self.sync += [
+            If(converter.source.valid & converter.source.ready,
+                If(converter.source.last,
+                    received.eq(0)
+                ).Else(
+                    received.eq(received + 1)
+                )
+            )
+        ]
+
+# LitePCIeDMADescriptorDoorbell -------------------------------------------------------------------
+
+class LitePCIeDMADescriptorDoorbell(Module):
+    """LitePCIe DMA Descriptor Doorbell
+
+    Descriptor submission through posted Writes to a dedicated BAR window.
+
+                              ┌──────────────┐    ┌──────────────┐
+      Writes (BAR window) ────►  Converter   ├────►   Entries    ├───► Descriptor (To Table).
+                              │  (to 32-bit) │    │ (16 bytes)   │
+                              └──────────────┘    └──────────────┘
+
+    Alternative to the value/we CSRs of LitePCIeDMAScatterGather: Software writes descriptors to the
+    window with the LitePCIeDMADescriptorRing entry format (16 bytes, offset in the window only used
+    for the position in the entry) and each complete entry is enqueued. A 64-bit write of words 0/1
+    enqueues a descriptor with a 32-bit address, a 128-bit write enqueues a full descriptor and a
+    write-combined burst enqueues several descriptors with a single TLP.
+
+    Reads of the window are completed with zeroes.
+    """
+    def __init__(self, endpoint, address_decoder, address_width=32, length_width=24):
+        assert address_width in [32, 64]
+        assert length_width  in [24, 32]
+        self.port = port = endpoint.crossbar.get_slave_port(address_decoder)
+        # Stream Endpoint.
+        self.source = source = stream.Endpoint(descriptor_layout(address_width=address_width))
+
+        # # #
+
+        # Converter (to 32-bit words) --------------------------------------------------------------
+        converter = stream.Converter(endpoint.phy.data_width, 32)
+        self.submodules += converter
+
+        # FSM --------------------------------------------------------------------------------------
+        offset = Signal(2)  # Position in the entry of the first word.
+        length = Signal(10) # Length of the Write (in words).
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            NextValue(offset, port.sink.adr[2:4]),
+            NextValue(length, port.sink.len),
+            # Wait for the words of the previous Write to be processed.
+            If(converter.source.valid,
+            ).Elif(port.sink.valid & port.sink.first,
+                If(port.sink.we,
+                    NextState("WRITE")
+                ).Else(
+                    NextState("READ-COMPLETION")
+                )
+            ).Else(
+                port.sink.ready.eq(1)
+            )
+        )
+        fsm.act("WRITE",
+            converter.sink.valid.eq(port.sink.valid),
+            converter.sink.last.eq(port.sink.last),
+            converter.sink.data.eq(port.sink.dat),
+            port.sink.ready.eq(converter.sink.ready),
+            If(port.sink.valid & port.sink.ready & port.sink.last,
+                NextState("IDLE")
+            )
+        )
+        self.comb += [
+            port.source.first.eq(1),
+            port.source.last.eq(1),
+            port.source.len.eq(1),
+            port.source.err.eq(0),
+            port.source.tag.eq(port.sink.tag),
+            port.source.adr.eq(port.sink.adr),
+            port.source.cmp_id.eq(endpoint.phy.id),
+            port.source.req_id.eq(port.sink.req_id),
+            port.source.dat.eq(0),
+        ]
+        fsm.act("READ-COMPLETION",
+            port.source.valid.eq(1),
+            If(port.source.ready,
+                port.sink.ready.eq(1),
+                NextState("IDLE")
+            )
+        )
+
+        # Entries ----------------------------------------------------------------------------------
+        count    = Signal(10) # Words of the current Write.
+        position = Signal(2)  # Position of the current word in the entry.
+        word     = converter.source.data
+        entry    = Array(Signal(32) for _ in range(4))
+        emit     = Signal()
+        self.comb += [
+            position.eq(offset + count),
+            # Emit a descriptor on the last word of an entry or on word 1 at the end of the Write.
+            If(count < length,
+                If(position == 3,
+                    emit.eq(1)
+                ),
+                If((count == (length - 1)) & (position == 1),
+                    emit.eq(1)
+                )
+            ),
+            converter.source.ready.eq(~emit | source.ready),
+            source.valid.eq(converter.source.valid & emit),
+            source.address[0:32].eq(entry[0]),
+        ]
+        if address_width == 64:
+            self.comb += If(position == 3, source.address[32:64].eq(entry[2]))
+        if length_width == 24:
+            length_word = Signal(32)
+            self.comb += [
+                length_word.eq(Mux(position == 1, word, entry[1])),
+                source.length.eq(      length_word[0:24]),
+                source.irq_disable.eq( length_word[24]),
+                source.last_disable.eq(length_word[25]),
+            ]
+        else:
+            self.comb += [
+                source.length.eq(Mux(position == 1, word, entry[1])),
+                If(position == 3,
+                    source.irq_disable.eq( word[0]),
+                    source.last_disable.eq(word[1]),
+                )
+            ]
+        self.sync += [
+            If(converter.source.valid & converter.source.ready,
+                entry[position].eq(word),
+                count.eq(count + 1),
+                If(converter.source.last,
+                    count.eq(0)
+                )
+            )
+        ]
+
 # LitePCIeDMADescriptorSplitter --------------------------------------------------------------------
 
 class LitePCIeDMADescriptorSplitter(Module, AutoCSR):
@@ -166,24 +560,50 @@ class LitePCIeDMADescriptorSplitter(Module, AutoCSR):
     - Maximum Payload Size for Writes.
     - Maximum Request Size for Reads.
 
-    Descriptors from LitePCIeDMAScatterGather have a maximum length of 16Mb (24-bits). It is not
-    possible to do such long Writes/Reads on the PCIe bus. At the PCIe enumeration, Maximum Payload
-    and Request Sizes are negotiated between the Host and the Device. Writes are limited to Maximum
-    Payload Size, Reads are limited to Maximum Request Size. Each descriptor is then split in
-    several shorter descriptors.
+    Descriptors from LitePCIeDMAScatterGather have a maximum length of 16MB (24-bit) or 4GB (32-bit,
+    Extended descriptor format). It is not possible to do such long Writes/Reads on the PCIe bus. At
+    the PCIe enumeration, Maximum Payload and Request Sizes are negotiated between the Host and the
+    Device. Writes are limited to Maximum Payload Size, Reads are limited to Maximum Request Size.
+    Each descriptor is then split in several shorter descriptors.
+
+    Splits are aligned on max_size: When the descriptor's address is not aligned, a shorter head
+    split is first emitted up to the next max_size aligned address, followed by full aligned splits.
+    Since max_size is a power of 2 <= 4KB, splits never cross a 4KB boundary and the Completions of
+    the Read Requests are split on RCB boundaries efficiently. Addresses are expected to be aligned on
+    the data-width.
+
+    Early termination is requested with a registered terminate pulse along with the user_id of the
+    split being executed: The descriptor is then ended with the next emitted split (with last set),
+    allowing the source to be buffered (splits already emitted for the descriptor have then to be
+    discarded by the DMA).
     """
     def __init__(self, max_size, address_width):
         # Stream Endpoints.
         self.sink   =   sink = stream.Endpoint(descriptor_layout(address_width=address_width))
         self.source = source = stream.Endpoint(descriptor_layout(address_width=address_width, with_user_id=True))
 
-        self.terminate = Signal() # Early Termination.
+        self.terminate    = Signal()  # Early Termination.
+        self.terminate_id = Signal(8) # Early Termination ID (user_id of the split being executed).
 
         # # #
 
         desc_length  = Signal(32)
         desc_offset  = Signal(32)
         desc_id      = Signal(32)
+        split_length = Signal(16)
+
+        # Early Termination ------------------------------------------------------------------------
+        terminate = Signal()
+        self.sync += [
+            # Set on Early Termination of the current descriptor...
+            If(self.terminate & (self.terminate_id == desc_id[:8]),
+                terminate.eq(1)
+            ),
+            # ... and clear on last split.
+            If(source.valid & source.ready & source.last,
+                terminate.eq(0)
+            )
+        ]
 
         # FSM --------------------------------------------------------------------------------------
         self.submodules.fsm = fsm = FSM(reset_state="IDLE")
@@ -202,16 +622,18 @@ class LitePCIeDMADescriptorSplitter(Module, AutoCSR):
             source.irq_disable.eq(sink.irq_disable),
             source.last_disable.eq(sink.last_disable),
             source.user_id.eq(desc_id),
+            # Split Length up to the next max_size aligned address.
+            split_length.eq(max_size - (source.address & (max_size - 1))),
         ]
         fsm.act("SPLIT",
             # Split Control-Path.
             source.valid.eq(1),
             source.first.eq(desc_offset == 0),
-            # Full Descriptor when Length > max_size.
-            If(desc_length > max_size,
-                source.last.eq(self.terminate),
-                source.length.eq(max_size),
-            # Partial Descriptor when Length <= max_size.
+            # Full Descriptor when Length > Split Length.
+            If(desc_length > split_length,
+                source.last.eq(terminate),
+                source.length.eq(split_length),
+            # Partial Descriptor when Length <= Split Length.
             ).Else(
                 source.last.eq(1),
                 source.length.eq(desc_length),
@@ -219,9 +641,9 @@ class LitePCIeDMADescriptorSplitter(Module, AutoCSR):
             # When Descriptor is accepted...
             If(source.ready,
                 # Increment Offset.
-                NextValue(desc_offset, desc_offset + max_size),
+                NextValue(desc_offset, desc_offset + split_length),
                 # Decrement Length.
-                NextValue(desc_length, desc_length - max_size),
+                NextValue(desc_length, desc_length - split_length),
                 # When Last....
                 If(source.last,
                     # Accept Descriptor.
@@ -234,6 +656,231 @@ class LitePCIeDMADescriptorSplitter(Module, AutoCSR):
             )
         )
 
+# LitePCIeDMAWriteback -----------------------------------------------------------------------------
+
+def writeback_layout():
+    return EndpointDescription([("length", 32), ("irq", 1), ("terminated", 1)])
+
+class LitePCIeDMAWriteback(Module, AutoCSR):
+    """LitePCIe DMA Writeback
+
+    Completion records writer to a ring in Host's memory.
+
+    Each time a descriptor is retired by the DMA, a completion record is written to the next entry
+    of a ring in Host's memory, allowing software to poll cached memory instead of doing MMIO reads
+    of the loop_status CSR (generalization of LitePCIeDMAStatus). A record is composed of:
+
+    0: 32-bit LSB of the Sequence Number.
+    1: 32-bit MSB of the Sequence Number.
+    2: 32-bit Byte Count (bytes effectively transferred, lower than the descriptor's length on early
+       termination).
+    3: Flags: bit 0: IRQ (descriptor's IRQ not disabled), bit 1: Terminated (descriptor ended on a
+       data stream's last).
+
+    Records are padded to the data-width when wider than 128-bit (to always be written with full
+    data-words), so the entry size is max(16, data_width//8) bytes.
+
+    The Sequence Number starts at 1 after a reset and is incremented for each record: Software can
+    clear the ring and then poll the entry of the next expected Sequence Number. The ring base address
+    has to be aligned on the entry size and the ring size has to be a power of 2.
+
+    Records are discarded when the Writeback is disabled.
+    """
+    def __init__(self, endpoint, port, address_width=32, depth=16):
+        assert address_width in [32, 64]
+        self.port = port
+        # Stream Endpoint.
+        self.sink = sink = stream.Endpoint(writeback_layout())
+
+        # Control/Status.
+        self.enable      = CSRStorage(description="Writeback Enable.")
+        self.address_lsb = CSRStorage(32, description="Ring Base Address (LSB) on Host.")
+        self.address_msb = CSRStorage(32, description="Ring Base Address (MSB) on Host.")
+        self.size        = CSRStorage(32, reset=2**16, description="Ring Size (in records, power of 2, up to 65536).")
+        self.index       = CSRStatus(16,  description="Ring index of the next record.")
+        self.reset       = CSRStorage(description="A write to this register resets the ring index and the Sequence Number.")
+
+        # # #
+
+        data_width   = endpoint.phy.data_width
+        dwords       = data_width//32
+        entry_dwords = max(4, dwords)
+        entry_size   = 4*entry_dwords
+        beats        = entry_dwords//dwords
+
+        # Records FIFO -----------------------------------------------------------------------------
+        fifo = stream.SyncFIFO(writeback_layout(), depth, buffered=True)
+        self.submodules.fifo = fifo
+        self.comb += sink.connect(fifo.sink)
+
+        # Record -----------------------------------------------------------------------------------
+        sequence = Signal(64, reset=1)
+        index    = Signal(16)
+        record   = Signal(32*entry_dwords)
+        self.comb += [
+            record[0*32:2*32].eq(sequence),
+            record[2*32:3*32].eq(fifo.source.length),
+            record[3*32+0].eq(fifo.source.irq),
+            record[3*32+1].eq(fifo.source.terminated),
+            self.index.status.eq(index),
+        ]
+
+        # FSM --------------------------------------------------------------------------------------
+        beat = Signal(max=max(beats, 2))
+        done = Signal()
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            NextValue(beat, 0),
+            If(fifo.source.valid,
+                If(self.enable.storage,
+                    NextState("WRITE")
+                # Discard Records when disabled.
+                ).Else(
+                    fifo.source.ready.eq(1)
+                )
+            )
+        )
+        # Write Data-Path.
+        self.comb += [
+            port.source.channel.eq(port.channel),
+            port.source.first.eq(beat == 0),
+            port.source.last.eq(beat == (beats - 1)),
+            port.source.we.eq(1),
+            port.source.req_id.eq(endpoint.phy.id),
+            port.source.tag.eq(0),
+            port.source.len.eq(entry_dwords),
+            port.source.adr.eq({
+                32:              (0x0000_0000 << 32) + self.address_lsb.storage,
+                64: (self.address_msb.storage << 32) + self.address_lsb.storage,
+            }[address_width] + (index << log2_int(entry_size))),
+        ]
+        if beats == 1:
+            self.comb += port.source.dat.eq(record)
+        else:
+            self.comb += port.source.dat.eq(Array(record[i*data_width:(i+1)*data_width] for i in range(beats))[beat])
+        fsm.act("WRITE",
+            # Write Control-Path.
+            port.source.valid.eq(1),
+            If(port.source.ready,
+                NextValue(beat, beat + 1),
+                If(port.source.last,
+                    # Accept Record.
+                    fifo.source.ready.eq(1),
+                    done.eq(1),
+                    NextState("IDLE")
+                )
+            )
+        )
+
+        # Update Sequence/Index.
+        self.sync += [
+            If(self.reset.re,
+                sequence.eq(1),
+                index.eq(0),
+            ).Elif(done,
+                sequence.eq(sequence + 1),
+                index.eq((index + 1) & (self.size.storage - 1)),
+            )
+        ]
+
+# LitePCIeDMAIRQModeration -------------------------------------------------------------------------
+
+class LitePCIeDMAIRQModeration(Module, AutoCSR):
+    """LitePCIe DMA IRQ Moderation
+
+    Coalesces the descriptors IRQs of a DMA Reader/Writer.
+
+    Without moderation, the IRQ rate is only controlled statically with the irq_disable bit of the
+    descriptors. When enabled, IRQs are coalesced and an IRQ is only generated after N descriptors
+    IRQs or T µs since the first pending one, whichever comes first.
+
+    In adaptive mode, the number of descriptors IRQs is counted over periods of T µs and N is
+    adjusted at the end of each period to: clamp(IRQs >> shift, count, count_max). N then increases
+    with the rate to generate ~2^shift IRQs per period at high rates while keeping the latency low
+    (N = count) at low rates.
+    """
+    def __init__(self, irq, sys_clk_freq=125e6):
+        self.irq = Signal()
+
+        self.control = CSRStorage(fields=[
+            CSRField("enable",   offset=0, size=1, description="IRQ Moderation Enable (IRQs are directly forwarded when disabled)."),
+            CSRField("adaptive", offset=1, size=1, description="Adaptive Mode Enable."),
+            CSRField("shift",    offset=4, size=4, description="Adaptive Mode Shift (~2^shift IRQs per period at high rates)."),
+        ])
+        self.count     = CSRStorage(16, reset=1,       description="Number of descriptors IRQs per IRQ (N, minimum in adaptive mode).")
+        self.count_max = CSRStorage(16, reset=2**16-1, description="Maximum Number of descriptors IRQs per IRQ (in adaptive mode).")
+        self.timeout   = CSRStorage(16,                description="Timeout (in µs) since the first pending descriptor IRQ (T, 0: Disabled).")
+        self.status    = CSRStatus(16,                 description="Current Number of descriptors IRQs per IRQ (N).")
+
+        # # #
+
+        enable   = self.control.fields.enable
+        adaptive = self.control.fields.adaptive
+
+        # µs Tick ----------------------------------------------------------------------------------
+        tick_cycles = max(int(sys_clk_freq/1e6), 1)
+        tick_count  = Signal(max=tick_cycles + 1)
+        tick        = Signal()
+        self.comb += tick.eq(tick_count == (tick_cycles - 1))
+        self.sync += [
+            tick_count.eq(tick_count + 1),
+            If(tick, tick_count.eq(0))
+        ]
+
+        # Adaptive N -------------------------------------------------------------------------------
+        period_timer  = Signal(16)
+        period_irqs   = Signal(32)
+        adaptive_irqs = Signal(32)
+        adaptive_n    = Signal(16)
+        self.sync += [
+            If(irq, period_irqs.eq(period_irqs + 1)),
+            If(tick,
+                period_timer.eq(period_timer + 1),
+                If(period_timer >= (self.timeout.storage - 1),
+                    period_timer.eq(0),
+                    period_irqs.eq(irq),
+                    adaptive_irqs.eq(period_irqs >> self.control.fields.shift),
+                )
+            )
+        ]
+        self.comb += [
+            If(adaptive_irqs < self.count.storage,
+                adaptive_n.eq(self.count.storage)
+            ).Elif(adaptive_irqs > self.count_max.storage,
+                adaptive_n.eq(self.count_max.storage)
+            ).Else(
+                adaptive_n.eq(adaptive_irqs)
+            )
+        ]
+
+        # Coalescing -------------------------------------------------------------------------------
+        n       = Signal(16)
+        pending = Signal(16)
+        timer   = Signal(16)
+        fire    = Signal()
+        self.comb += [
+            n.eq(Mux(adaptive, adaptive_n, self.count.storage)),
+            self.status.status.eq(n),
+            # Fire after N descriptors IRQs...
+            If((pending + irq) >= n,
+                fire.eq(1)
+            ),
+            # ... or T µs since the first pending one.
+            If((pending != 0) & (self.timeout.storage != 0) & (timer >= self.timeout.storage),
+                fire.eq(1)
+            ),
+        ]
+        self.sync += [
+            If(~enable | fire,
+                pending.eq(0),
+                timer.eq(0),
+            ).Else(
+                If(irq, pending.eq(pending + 1)),
+                If(tick & (pending != 0), timer.eq(timer + 1)),
+            )
+        ]
+        self.comb += self.irq.eq(Mux(enable, fire & ((pending != 0) | irq), irq))
+
 # LitePCIeDMAReader --------------------------------------------------------------------------------
 
 class LitePCIeDMAReader(Module, AutoCSR):
@@ -242,15 +889,21 @@ class LitePCIeDMAReader(Module, AutoCSR):
     Generates a data stream from Host's memory.
 
     This module allows Scatter-Gather DMAs from Host's memory to data stream in the FPGA. The DMA
-    descriptors, stored in a software programmable table, are split and executed as Read Requests
-    on the PCIe bus.
+    descriptors, stored in a software programmable table (or fetched from a descriptor ring in Host's
+    memory), are split and executed as Read Requests on the PCIe bus.
 
     A Read Request is only sent to the Host when enough space is available in the Data FIFO to store
-    the requested data.
+    the requested data. Read Requests can be issued back-to-back (one per cycle).
+
+    Descriptors lengths are byte-granular: The last data-word of each descriptor is padded and its
+    valid bytes are indicated with keep.
 
-    A MSI IRQ can be generated when a descriptor has been executed.
+    A MSI IRQ can be generated when a descriptor has been executed (optionally coalesced with
+    with_irq_moderation) and a completion record can be written to Host's memory (with_writeback).
     """
-    def __init__(self, endpoint, port, with_table=True, table_depth=256, address_width=32):
+    def __init__(self, endpoint, port, with_table=True, table_depth=256, address_width=32, with_ring=False,
+        with_writeback=False, with_irq_moderation=False, sys_clk_freq=125e6, length_width=24,
+        with_doorbell=False, doorbell_address_decoder=None):
         self.port = port
         # Stream Endpoint.
         self.source = stream.Endpoint(dma_layout(endpoint.phy.data_width))
@@ -266,13 +919,32 @@ class LitePCIeDMAReader(Module, AutoCSR):
         # CSR/Parameters ---------------------------------------------------------------------------
         self.enable = enable = self._enable.storage
 
-        length_shift          = log2_int(endpoint.phy.data_width//8)
-        max_words_per_request = max_request_size//(endpoint.phy.data_width//8)
+        data_width            = endpoint.phy.data_width
+        length_shift          = log2_int(data_width//8)
+        max_words_per_request = max_request_size//(data_width//8)
         max_pending_words     = endpoint.max_pending_requests*max_words_per_request
 
-        # Table ------------------------------------------------------------------------------------
-        if with_table:
-            self.submodules.table = LitePCIeDMAScatterGather(table_depth, address_width=address_width)
+        # Table/Ring -------------------------------------------------------------------------------
+        if with_ring:
+            self.submodules.ring = LitePCIeDMADescriptorRing(
+                endpoint      = endpoint,
+                port          = endpoint.crossbar.get_master_port(read_only=True),
+                address_width = address_width,
+                length_width  = length_width,
+            )
+        elif with_table:
+            self.submodules.table = LitePCIeDMAScatterGather(table_depth,
+                address_width = address_width,
+                length_width  = length_width,
+                with_sink     = with_doorbell,
+            )
+            if with_doorbell:
+                self.submodules.doorbell = LitePCIeDMADescriptorDoorbell(endpoint,
+                    address_decoder = doorbell_address_decoder,
+                    address_width   = address_width,
+                    length_width    = length_width,
+                )
+                self.comb += self.doorbell.source.connect(self.table.sink)
         else:
             self.desc_sink = stream.Endpoint(descriptor_layout(address_width=address_width)) # Expose a Descriptor sink.
 
@@ -285,20 +957,43 @@ class LitePCIeDMAReader(Module, AutoCSR):
         splitter = ResetInserter()(splitter)
         splitter = BufferizeEndpoints({"source": DIR_SOURCE})(splitter) # For timings.
         self.submodules.splitter = splitter
-        if with_table:
+        if with_ring:
+            self.comb += self.ring.source.connect(splitter.sink)
+        elif with_table:
             self.comb += self.table.source.connect(splitter.sink)
         else:
             self.comb += self.desc_sink.connect(splitter.sink)
 
+        # Writeback --------------------------------------------------------------------------------
+        writeback_ready = Signal(reset=1)
+        if with_writeback:
+            self.submodules.writeback = LitePCIeDMAWriteback(
+                endpoint      = endpoint,
+                port          = endpoint.crossbar.get_master_port(write_only=True),
+                address_width = address_width
+            )
+            self.comb += writeback_ready.eq(self.writeback.sink.ready)
+
         # User ID ----------------------------------------------------------------------------------
         last_user_id = Signal(8, reset=255)
         self.sync += If(port.sink.valid & port.sink.first & port.sink.ready,
             last_user_id.eq(port.sink.user_id)
         )
 
+        # Keep FIFO --------------------------------------------------------------------------------
+        # Store the Bytes valid on the last data-word of each Request (Byte-granular lengths).
+        keep_fifo = SyncFIFO([("keep", data_width//8)], 2*endpoint.max_pending_requests, buffered=True)
+        self.submodules.keep_fifo = ResetInserter()(keep_fifo)
+        self.comb += last_word_keep(
+            keep       = keep_fifo.sink.keep,
+            length     = splitter.source.length,
+            data_width = data_width,
+            endianness = endpoint.endianness,
+        )
+
         # Data FIFO --------------------------------------------------------------------------------
         data_fifo_depth = 4*max_pending_words
-        data_fifo = SyncFIFO(dma_layout(endpoint.phy.data_width), data_fifo_depth, buffered=True)
+        data_fifo = SyncFIFO(dma_layout(data_width), data_fifo_depth, buffered=True)
         self.submodules.data_fifo = ResetInserter()(data_fifo)
         self.comb += [
             # Connect Data FIFO to Source.
@@ -307,7 +1002,13 @@ class LitePCIeDMAReader(Module, AutoCSR):
             If(enable,
                 port.sink.connect(data_fifo.sink, keep={"valid", "ready"}),
                 data_fifo.sink.data.eq(port.sink.dat),
+                data_fifo.sink.keep.eq(2**(data_width//8) - 1),
                 data_fifo.sink.first.eq(port.sink.first & (port.sink.user_id != last_user_id)),
+                # On last data-word of the Request, set Keep and dequeue it.
+                If(port.sink.last & port.sink.end,
+                    data_fifo.sink.keep.eq(keep_fifo.source.keep),
+                    keep_fifo.source.ready.eq(port.sink.valid & port.sink.ready),
+                ),
             # Else accept incoming Port Data.
             ).Else(
                 port.sink.ready.eq(1)
@@ -321,7 +1022,7 @@ class LitePCIeDMAReader(Module, AutoCSR):
         self.comb += [
             # Queue Pending words as Read Requests are emitted.
             If(splitter.source.valid & splitter.source.ready,
-                pending_words_queue.eq(splitter.source.length[length_shift:])
+                pending_words_queue.eq((splitter.source.length + (2**length_shift - 1))[length_shift:])
             ),
             # Dequeue Pending words as Read Responses are received.
             If(data_fifo.source.valid & data_fifo.source.ready,
@@ -332,18 +1033,19 @@ class LitePCIeDMAReader(Module, AutoCSR):
         self.sync += pending_words.eq(pending_words + pending_words_queue - pending_words_dequeue)
         self.sync += If(~enable, pending_words.eq(0))
 
-        # FSM --------------------------------------------------------------------------------------
-        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
-        fsm.act("IDLE",
-            # Reset Splitter/FIFO when disabled.
-            If(~enable,
-                splitter.reset.eq(1),
-                data_fifo.reset.eq(1),
-            ),
-            # Wait for a Descriptor and to have enough Space to generate the Request.
-            If(splitter.source.valid & (pending_words < (data_fifo_depth - max_words_per_request)),
-                NextState("MEM-RD-REQ"),
-            )
+        # Space Check ------------------------------------------------------------------------------
+        # Registered (for timings) from the next Pending words value: Always up to date with the
+        # Requests issued on previous cycles, so Requests can be issued back-to-back.
+        space_available = Signal()
+        self.sync += space_available.eq(
+            (pending_words + pending_words_queue - pending_words_dequeue) < (data_fifo_depth - max_words_per_request))
+
+        # Request Issue ----------------------------------------------------------------------------
+        # Reset Splitter/FIFO when disabled.
+        self.comb += If(~enable,
+            splitter.reset.eq(1),
+            keep_fifo.reset.eq(1),
+            data_fifo.reset.eq(1),
         )
         # Request Data-Path.
         self.comb += [
@@ -353,26 +1055,49 @@ class LitePCIeDMAReader(Module, AutoCSR):
             port.source.last.eq(1),
             port.source.we.eq(0),
             port.source.adr.eq(splitter.source.address),
-            port.source.len.eq(splitter.source.length[2:]),
+            port.source.len.eq((splitter.source.length + 3)[2:]),
             port.source.req_id.eq(endpoint.phy.id),
             port.source.dat.eq(0),
         ]
-        fsm.act("MEM-RD-REQ",
-            # Request Control-Path.
-            port.source.valid.eq(1),
-            # When Request is accepted...
-            If(port.source.ready,
-                # Accept Descriptor.
-                splitter.source.ready.eq(1),
-                # Return to Idle.
-                NextState("IDLE"),
-            )
+        self.comb += request_byte_enables(port.source, splitter.source.length)
+        # Request Control-Path: Issue a Request on each cycle when a Descriptor is available with
+        # enough Space to store the Data (and when a Writeback record can be queued).
+        self.comb += If(enable & space_available & keep_fifo.sink.ready & writeback_ready,
+            port.source.valid.eq(splitter.source.valid),
+            splitter.source.ready.eq(port.source.ready),
+            keep_fifo.sink.valid.eq(port.source.valid & port.source.ready),
         )
 
         # IRQ --------------------------------------------------------------------------------------
+        irq = Signal()
         self.comb += If(splitter.source.valid & splitter.source.ready & splitter.source.last,
-            self.irq.eq(~splitter.source.irq_disable)
+            irq.eq(~splitter.source.irq_disable)
         )
+        if with_irq_moderation:
+            self.submodules.irq_moderation = LitePCIeDMAIRQModeration(irq, sys_clk_freq=sys_clk_freq)
+            self.comb += self.irq.eq(self.irq_moderation.irq)
+        else:
+            self.comb += self.irq.eq(irq)
+
+        # Writeback Record -------------------------------------------------------------------------
+        if with_writeback:
+            desc_bytes = Signal(32)
+            self.sync += [
+                If(splitter.source.valid & splitter.source.ready,
+                    If(splitter.source.last,
+                        desc_bytes.eq(0)
+                    ).Else(
+                        desc_bytes.eq(desc_bytes + splitter.source.length)
+                    )
+                ),
+                If(~enable, desc_bytes.eq(0))
+            ]
+            self.comb += [
+                self.writeback.sink.valid.eq(splitter.source.valid & splitter.source.ready & splitter.source.last),
+                self.writeback.sink.length.eq(desc_bytes + splitter.source.length),
+                self.writeback.sink.irq.eq(~splitter.source.irq_disable),
+                self.writeback.sink.terminated.eq(0),
+            ]
 
 # LitePCIeDMAWriter --------------------------------------------------------------------------------
 
@@ -382,15 +1107,30 @@ class LitePCIeDMAWriter(Module, AutoCSR):
     Stores a data stream to Host's memory.
 
     This module allows Scatter-Gather DMAs from a data stream in the FPGA to Host's memory. The DMA
-    descriptors, stored in a software programmable table, are split and executed as Write Requests
-    on the PCIe bus.
+    descriptors, stored in a software programmable table (or fetched from a descriptor ring in Host's
+    memory), are split and executed as Write Requests on the PCIe bus.
 
     A Write Request is only sent to the Host when enough data are available for the current split
-    descriptor.
+    descriptor (Store-and-Forward).
+
+    Descriptors lengths are byte-granular: The last data-word of each descriptor is only partially
+    written (with the Byte Enables of the Write Request) when the length is not a multiple of the
+    data-width.
 
-    A MSI IRQ can be generated when a descriptor has been executed.
+    An optional Cut-Through mode (with_cut_through) can be enabled for sources able to guarantee a
+    sustained data rate (ex ADC streams): the Write Request is then sent as soon as a programmable
+    threshold of data-words is buffered, reducing latency and allowing a smaller Data FIFO. Underrun
+    policy: When the source stalls in the middle of a Write Request, the Request is stalled (valid
+    de-asserted, the PHY has to support source throttling) until data is available again, stalled
+    cycles are counted in the underruns CSR.
+
+    A MSI IRQ can be generated when a descriptor has been executed (optionally coalesced with
+    with_irq_moderation) and a completion record can be written to Host's memory (with_writeback).
     """
-    def __init__(self, endpoint, port, with_table=True, table_depth=256, address_width=32):
+    def __init__(self, endpoint, port, with_table=True, table_depth=256, address_width=32, with_ring=False,
+        with_writeback=False, with_irq_moderation=False, sys_clk_freq=125e6,
+        with_cut_through=False, data_fifo_depth=None, length_width=24,
+        with_doorbell=False, doorbell_address_decoder=None):
         self.port = port
         # Stream Endpoint.
         self.sink = sink = stream.Endpoint(dma_layout(endpoint.phy.data_width))
@@ -398,6 +1138,14 @@ class LitePCIeDMAWriter(Module, AutoCSR):
         # Control.
         self._enable = CSRStorage(description="DMA Writer Control. Write ``1`` to enable DMA Writer.", reset=0 if with_table else 1)
 
+        # Cut-Through.
+        if with_cut_through:
+            self.cut_through = CSRStorage(fields=[
+                CSRField("enable",    offset=0,  size=1,  description="Cut-Through Enable (Store-and-Forward when disabled)."),
+                CSRField("threshold", offset=16, size=16, description="Number of buffered data-words required to start a Write Request.", reset=1),
+            ])
+            self.underruns = CSRStatus(32, description="Number of cycles Write Requests have been stalled (Data FIFO underrun).")
+
         # IRQ.
         self.irq = Signal()
 
@@ -406,12 +1154,31 @@ class LitePCIeDMAWriter(Module, AutoCSR):
         # CSR/Parameters ---------------------------------------------------------------------------
         self.enable = enable = self._enable.storage
 
-        length_shift          = log2_int(endpoint.phy.data_width//8)
-        max_words_per_request = max_payload_size//(endpoint.phy.data_width//8)
+        data_width            = endpoint.phy.data_width
+        length_shift          = log2_int(data_width//8)
+        max_words_per_request = max_payload_size//(data_width//8)
 
-        # Table ------------------------------------------------------------------------------------
-        if with_table:
-            self.submodules.table = LitePCIeDMAScatterGather(table_depth, address_width)
+        # Table/Ring -------------------------------------------------------------------------------
+        if with_ring:
+            self.submodules.ring = LitePCIeDMADescriptorRing(
+                endpoint      = endpoint,
+                port          = endpoint.crossbar.get_master_port(read_only=True),
+                address_width = address_width,
+                length_width  = length_width,
+            )
+        elif with_table:
+            self.submodules.table = LitePCIeDMAScatterGather(table_depth,
+                address_width = address_width,
+                length_width  = length_width,
+                with_sink     = with_doorbell,
+            )
+            if with_doorbell:
+                self.submodules.doorbell = LitePCIeDMADescriptorDoorbell(endpoint,
+                    address_decoder = doorbell_address_decoder,
+                    address_width   = address_width,
+                    length_width    = length_width,
+                )
+                self.comb += self.doorbell.source.connect(self.table.sink)
         else:
             self.desc_sink = stream.Endpoint(descriptor_layout(address_width=address_width)) # Expose a Descriptor sink.
 
@@ -422,22 +1189,50 @@ class LitePCIeDMAWriter(Module, AutoCSR):
             address_width = address_width
         )
         splitter = ResetInserter()(splitter)
-        #splitter = BufferizeEndpoints({"source": DIR_SOURCE})(splitter) # For timings. # FIXME: Prevent early termination.
+        splitter = BufferizeEndpoints({"source": DIR_SOURCE})(splitter) # For timings.
         self.submodules.splitter = splitter
-        if with_table:
+        if with_ring:
+            self.comb += self.ring.source.connect(splitter.sink)
+        elif with_table:
             self.comb += self.table.source.connect(splitter.sink)
         else:
             self.comb += self.desc_sink.connect(splitter.sink)
 
+        # Writeback --------------------------------------------------------------------------------
+        writeback_ready = Signal(reset=1)
+        if with_writeback:
+            self.submodules.writeback = LitePCIeDMAWriteback(
+                endpoint      = endpoint,
+                port          = endpoint.crossbar.get_master_port(write_only=True),
+                address_width = address_width
+            )
+            self.comb += writeback_ready.eq(self.writeback.sink.ready)
+
         # Data FIFO --------------------------------------------------------------------------------
-        data_fifo_depth = 4*max_words_per_request
-        data_fifo = stream.SyncFIFO([("data", endpoint.phy.data_width)], data_fifo_depth, buffered=True)
+        if data_fifo_depth is None:
+            data_fifo_depth = 4*max_words_per_request
+        assert data_fifo_depth >= max_words_per_request # Required for Store-and-Forward.
+        data_fifo = stream.SyncFIFO(dma_layout(data_width), data_fifo_depth, buffered=True)
         self.submodules.data_fifo = ResetInserter()(data_fifo)
          # By default, accept incoming stream when disabled.
         self.comb += sink.ready.eq(1)
         # When Enabled, connect Sink to Data FIFO.
         self.comb += If(enable, sink.connect(data_fifo.sink))
 
+        # Request Words ----------------------------------------------------------------------------
+        req_words = Signal(32 - length_shift)
+        self.comb += req_words.eq((splitter.source.length + (2**length_shift - 1))[length_shift:])
+
+        # Data Ready -------------------------------------------------------------------------------
+        # Store-and-Forward: Enough Data for the Request. Cut-Through: Enough Data for the Request or
+        # more Data than the threshold.
+        data_ready = Signal()
+        self.comb += data_ready.eq(data_fifo.level >= req_words)
+        if with_cut_through:
+            self.comb += If(self.cut_through.fields.enable & (data_fifo.level >= self.cut_through.fields.threshold),
+                data_ready.eq(1)
+            )
+
         # FSM --------------------------------------------------------------------------------------
         req_count = Signal.like(splitter.source.length)
         self.submodules.fsm = fsm = FSM(reset_state="IDLE")
@@ -449,8 +1244,9 @@ class LitePCIeDMAWriter(Module, AutoCSR):
             ),
             # Reset Request Count.
             NextValue(req_count, 0),
-            # Wait for a Descriptor and to have enough Data to generate the Request.
-            If(splitter.source.valid & (data_fifo.level >= splitter.source.length[length_shift:]),
+            # Wait for a Descriptor and to have enough Data to generate the Request (and to be able
+            # to queue a Writeback record).
+            If(splitter.source.valid & data_ready & writeback_ready,
                 NextState("MEM-WR"),
             )
         )
@@ -459,42 +1255,133 @@ class LitePCIeDMAWriter(Module, AutoCSR):
             port.source.channel.eq(port.channel),
             port.source.user_id.eq(splitter.source.user_id),
             port.source.first.eq(req_count == 0),
-            port.source.last.eq( req_count == (splitter.source.length[length_shift:] - 1)),
+            port.source.last.eq( req_count == (req_words - 1)),
             port.source.we.eq(1),
             port.source.adr.eq(splitter.source.address),
             port.source.req_id.eq(endpoint.phy.id),
             port.source.tag.eq(0),
-            port.source.len.eq(splitter.source.length[2:]),
+            port.source.len.eq((splitter.source.length + 3)[2:]),
             port.source.dat.eq(data_fifo.source.data),
         ]
+        self.comb += request_byte_enables(port.source, splitter.source.length)
         # Early termination on last (Optional, can be dynamically disabled).
-        self.comb += splitter.terminate.eq(data_fifo.source.last & ~splitter.source.last_disable)
+        terminate  = Signal()
+        terminated = Signal()
+        self.comb += terminate.eq(data_fifo.source.last & ~splitter.source.last_disable)
+        # Registered to the Splitter (for timings): The Splitter ends the descriptor with its next
+        # split, already buffered splits of the descriptor are then flushed.
+        self.sync += [
+            splitter.terminate.eq(port.source.valid & port.source.ready & terminate),
+            splitter.terminate_id.eq(splitter.source.user_id),
+        ]
 
         fsm.act("MEM-WR",
-            # Request Control-Path.
-            port.source.valid.eq(1),
+            # Request Control-Path (Data is always available in Store-and-Forward mode, Request is
+            # stalled on Data FIFO underrun in Cut-Through mode).
+            port.source.valid.eq(data_fifo.source.valid),
             # When Request is accepted...
-            If(port.source.ready,
+            If(port.source.valid & port.source.ready,
                 # Increment Request Count.
                 NextValue(req_count, req_count + 1),
                 # Accept Data (Only when not terminated).
-                data_fifo.source.ready.eq(~splitter.terminate),
+                data_fifo.source.ready.eq(~terminate),
+                If(terminate, NextValue(terminated, 1)),
                 # When last...
                 If(port.source.last,
                     # Accept Descriptor.
                     splitter.source.ready.eq(1),
                     # Accept Data (Force).
                     data_fifo.source.ready.eq(1),
-                    # Return to Idle.
-                    NextState("IDLE"),
+                    NextValue(terminated, 0),
+                    # Flush Descriptor when terminated before its last split...
+                    If((terminate | terminated) & ~splitter.source.last,
+                        NextState("FLUSH")
+                    # ... else return to Idle.
+                    ).Else(
+                        NextState("IDLE")
+                    )
                 )
             )
         )
+        fsm.act("FLUSH",
+            # Discard the remaining splits of the terminated Descriptor.
+            splitter.source.ready.eq(1),
+            If((splitter.source.valid & splitter.source.last) | ~enable,
+                NextState("IDLE")
+            )
+        )
+
+        # Underruns --------------------------------------------------------------------------------
+        if with_cut_through:
+            self.sync += If(fsm.ongoing("MEM-WR") & ~data_fifo.source.valid,
+                self.underruns.status.eq(self.underruns.status + 1)
+            )
 
         # IRQ --------------------------------------------------------------------------------------
+        irq = Signal()
         self.comb += If(splitter.source.valid & splitter.source.ready & splitter.source.last,
-            self.irq.eq(~splitter.source.irq_disable)
+            irq.eq(~splitter.source.irq_disable)
         )
+        if with_irq_moderation:
+            self.submodules.irq_moderation = LitePCIeDMAIRQModeration(irq, sys_clk_freq=sys_clk_freq)
+            self.comb += self.irq.eq(self.irq_moderation.irq)
+        else:
+            self.comb += self.irq.eq(irq)
+
+        # Writeback Record -------------------------------------------------------------------------
+        if with_writeback:
+            # Count the Data effectively written: Splits lengths or, on early termination, consumed
+            # data-words (Data is no longer consumed after early termination) minus the invalid bytes
+            # of the last data-word.
+            desc_bytes      = Signal(32)
+            desc_words      = Signal(32 - length_shift)
+            desc_pad        = Signal(length_shift + 1)
+            desc_terminated = Signal()
+            data_words      = Signal(32 - length_shift)
+            data_keep_bytes = Signal(length_shift + 1)
+            data_pad        = Signal(length_shift + 1)
+            self.comb += [
+                data_words.eq(desc_words + (data_fifo.source.valid & data_fifo.source.ready)),
+                data_keep_bytes.eq(sum(data_fifo.source.keep[i] for i in range(data_width//8))),
+                If(data_fifo.source.keep != 0,
+                    data_pad.eq((data_width//8) - data_keep_bytes)
+                ),
+            ]
+            self.sync += [
+                If(splitter.source.valid & splitter.source.ready,
+                    If(splitter.source.last,
+                        desc_bytes.eq(0),
+                    ).Else(
+                        desc_bytes.eq(desc_bytes + splitter.source.length),
+                    )
+                ),
+                If(splitter.source.valid & splitter.source.ready & splitter.source.last,
+                    desc_words.eq(0),
+                    desc_terminated.eq(0),
+                ).Elif(port.source.valid & port.source.ready,
+                    desc_words.eq(data_words),
+                    If(terminate,
+                        desc_pad.eq(data_pad),
+                        desc_terminated.eq(1),
+                    ),
+                ),
+                If(~enable,
+                    desc_bytes.eq(0),
+                    desc_words.eq(0),
+                    desc_terminated.eq(0),
+                )
+            ]
+            self.comb += [
+                self.writeback.sink.valid.eq(splitter.source.valid & splitter.source.ready & splitter.source.last),
+                self.writeback.sink.length.eq(desc_bytes + splitter.source.length),
+                If(terminate,
+                    self.writeback.sink.length.eq((data_words << length_shift) - data_pad)
+                ).Elif(desc_terminated,
+                    self.writeback.sink.length.eq((data_words << length_shift) - desc_pad)
+                ),
+                self.writeback.sink.irq.eq(~splitter.source.irq_disable),
+                self.writeback.sink.terminated.eq(desc_terminated | terminate),
+            ]
 
 # LitePCIeDMALoopback ------------------------------------------------------------------------------
 
@@ -757,6 +1644,8 @@ class LitePCIeDMAStatus(Module, AutoCSR):
         # --------------------
         status = Array([Signal(32) for _ in range(16)])
         # 0-7:  Internal.
+        for table in [writer.table, reader.table]:
+            assert len(table.loop_status.status) == 32 # Tables of up to 64K descriptors.
         sync_word = 0x5aa55aa5
         self.comb += [
             status[0].eq(0x5aa55aa5),
@@ -837,28 +1726,54 @@ class LitePCIeDMA(Module, AutoCSR):
 
     Optional buffering, loopback, synchronization and monitoring.
     """
-    def __init__(self, phy, endpoint, table_depth=256, address_width=32,
-        with_loopback      = False,
-        with_synchronizer  = False,
-        with_buffering     = False, buffering_depth=256*8, writer_buffering_depth=None, reader_buffering_depth=None,
-        with_monitor       = False,
-        with_status        = False):
+    def __init__(self, phy, endpoint, table_depth=256, address_width=32, length_width=24,
+        with_ring               = False,
+        with_writeback          = False,
+        with_irq_moderation     = False, sys_clk_freq=125e6,
+        with_writer_cut_through = False, writer_data_fifo_depth=None,
+        with_doorbell           = False, doorbell_address_decoders=None,
+        with_loopback           = False,
+        with_synchronizer       = False,
+        with_buffering          = False, buffering_depth=256*8, writer_buffering_depth=None, reader_buffering_depth=None,
+        with_monitor            = False,
+        with_status             = False):
 
         # Parameters -------------------------------------------------------------------------------
         self.data_width = data_width = phy.data_width
 
         # Writer/Reader ----------------------------------------------------------------------------
+        # Doorbells: One BAR window for the Writer and one for the Reader ({"writer": decoder, "reader": decoder}).
+        if with_doorbell:
+            assert set(doorbell_address_decoders.keys()) == {"writer", "reader"}
+        else:
+            doorbell_address_decoders = {"writer": None, "reader": None}
         writer = LitePCIeDMAWriter(
-            endpoint      = endpoint,
-            port          = endpoint.crossbar.get_master_port(write_only=True),
-            table_depth   = table_depth,
-            address_width = address_width,
+            endpoint                 = endpoint,
+            port                     = endpoint.crossbar.get_master_port(write_only=True),
+            table_depth              = table_depth,
+            address_width            = address_width,
+            length_width             = length_width,
+            with_ring                = with_ring,
+            with_writeback           = with_writeback,
+            with_irq_moderation      = with_irq_moderation,
+            sys_clk_freq             = sys_clk_freq,
+            with_cut_through         = with_writer_cut_through,
+            data_fifo_depth          = writer_data_fifo_depth,
+            with_doorbell            = with_doorbell,
+            doorbell_address_decoder = doorbell_address_decoders["writer"],
         )
         reader = LitePCIeDMAReader(
-            endpoint      = endpoint,
-            port          = endpoint.crossbar.get_master_port(read_only=True),
-            table_depth   = table_depth,
-            address_width = address_width,
+            endpoint                 = endpoint,
+            port                     = endpoint.crossbar.get_master_port(read_only=True),
+            table_depth              = table_depth,
+            address_width            = address_width,
+            length_width             = length_width,
+            with_ring                = with_ring,
+            with_writeback           = with_writeback,
+            with_irq_moderation      = with_irq_moderation,
+            sys_clk_freq             = sys_clk_freq,
+            with_doorbell            = with_doorbell,
+            doorbell_address_decoder = doorbell_address_decoders["reader"],
         )
         self.submodules.writer = writer
         self.submodules.reader = reader
@@ -224,8 +224,14 @@ class LitePCIeCore(SoCMini):
         # PCIe DMA ---------------------------------------------------------------------------------
         pcie_dmas = []
         self.add_constant("DMA_CHANNELS", core_config["dma_channels"])
+        dma_table_depth  = core_config.get("dma_table_depth",  256)
+        dma_length_width = core_config.get("dma_length_width", 24)
+        if dma_length_width == 32:
+            self.add_constant("DMA_EXTENDED_DESCRIPTOR")
         for i in range(core_config["dma_channels"]):
             pcie_dma = LitePCIeDMA(self.pcie_phy, self.pcie_endpoint,
+                table_depth       = dma_table_depth,
+                length_width      = dma_length_width,
                 with_buffering    = core_config["dma_buffering"] != 0,
                 buffering_depth   = core_config["dma_buffering"],
                 with_loopback     = core_config["dma_loopback"],
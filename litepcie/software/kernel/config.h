@@ -49,8 +49,14 @@
 /* /!\ Keep in sync with csr.h  /!\ */
 
 /* DMA Flags */
+#ifndef DMA_EXTENDED_DESCRIPTOR
 #define DMA_IRQ_DISABLE  (1<<24)
 #define DMA_LAST_DISABLE (1<<25)
+#else
+/* Extended descriptor format (32-bit Length): Flags in a separate 32-bit word. */
+#define DMA_IRQ_DISABLE  (1<<0)
+#define DMA_LAST_DISABLE (1<<1)
+#endif
 
 #define DMA_CHANNEL_COUNT      DMA_CHANNELS
 #define DMA_BUFFER_PER_IRQ     32
@@ -60,6 +66,7 @@
 //#define DMA_BUFFER_ALIGNED
 
 /* DMA Offsets */
+#ifndef DMA_EXTENDED_DESCRIPTOR
 #define PCIE_DMA_WRITER_ENABLE_OFFSET             0x0000
 #define PCIE_DMA_WRITER_TABLE_VALUE_OFFSET        0x0004
 #define PCIE_DMA_WRITER_TABLE_WE_OFFSET           0x000c
@@ -79,6 +86,28 @@
 #define PCIE_DMA_BUFFERING_READER_FIFO_LEVEL_ADDR 0x0048
 #define PCIE_DMA_BUFFERING_WRITER_FIFO_DEPTH_ADDR 0x004c
 #define PCIE_DMA_BUFFERING_WRITER_FIFO_LEVEL_ADDR 0x0050
+#else
+/* Extended descriptor format (32-bit Length): 96-bit Table Value CSRs. */
+#define PCIE_DMA_WRITER_ENABLE_OFFSET             0x0000
+#define PCIE_DMA_WRITER_TABLE_VALUE_OFFSET        0x0004
+#define PCIE_DMA_WRITER_TABLE_WE_OFFSET           0x0010
+#define PCIE_DMA_WRITER_TABLE_LOOP_PROG_N_OFFSET  0x0014
+#define PCIE_DMA_WRITER_TABLE_LOOP_STATUS_OFFSET  0x0018
+#define PCIE_DMA_WRITER_TABLE_LEVEL_OFFSET        0x001c
+#define PCIE_DMA_WRITER_TABLE_FLUSH_OFFSET        0x0020
+#define PCIE_DMA_READER_ENABLE_OFFSET             0x0024
+#define PCIE_DMA_READER_TABLE_VALUE_OFFSET        0x0028
+#define PCIE_DMA_READER_TABLE_WE_OFFSET           0x0034
+#define PCIE_DMA_READER_TABLE_LOOP_PROG_N_OFFSET  0x0038
+#define PCIE_DMA_READER_TABLE_LOOP_STATUS_OFFSET  0x003c
+#define PCIE_DMA_READER_TABLE_LEVEL_OFFSET        0x0040
+#define PCIE_DMA_READER_TABLE_FLUSH_OFFSET        0x0044
+#define PCIE_DMA_LOOPBACK_ENABLE_OFFSET           0x0048
+#define PCIE_DMA_BUFFERING_READER_FIFO_DEPTH_ADDR 0x004c
+#define PCIE_DMA_BUFFERING_READER_FIFO_LEVEL_ADDR 0x0050
+#define PCIE_DMA_BUFFERING_WRITER_FIFO_DEPTH_ADDR 0x0054
+#define PCIE_DMA_BUFFERING_WRITER_FIFO_LEVEL_ADDR 0x0058
+#endif
 
 /* /!\ Keep in sync with csr.h  /!\ */
 
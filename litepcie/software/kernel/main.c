@@ -193,6 +193,7 @@ static void litepcie_dma_writer_start(struct litepcie_device *s, int chan_num)
 	litepcie_writel(s, dmachan->base + PCIE_DMA_WRITER_TABLE_LOOP_PROG_N_OFFSET, 0);
 	for (i = 0; i < DMA_BUFFER_COUNT; i++) {
 		/* Fill buffer size + parameters. */
+#ifndef DMA_EXTENDED_DESCRIPTOR
 		litepcie_writel(s, dmachan->base + PCIE_DMA_WRITER_TABLE_VALUE_OFFSET,
 #ifndef DMA_BUFFER_ALIGNED
 			DMA_LAST_DISABLE |
@@ -201,6 +202,18 @@ static void litepcie_dma_writer_start(struct litepcie_device *s, int chan_num)
 			DMA_BUFFER_SIZE);                                  /* every n buffers */
 		/* Fill 32-bit Address LSB. */
 		litepcie_writel(s, dmachan->base + PCIE_DMA_WRITER_TABLE_VALUE_OFFSET + 4, (dmachan->writer_handle[i] >>  0) & 0xffffffff);
+#else
+		/* Fill parameters (Extended descriptor format). */
+		litepcie_writel(s, dmachan->base + PCIE_DMA_WRITER_TABLE_VALUE_OFFSET,
+#ifndef DMA_BUFFER_ALIGNED
+			DMA_LAST_DISABLE |
+#endif
+			(!(i%DMA_BUFFER_PER_IRQ == 0)) * DMA_IRQ_DISABLE); /* generate an msi every n buffers */
+		/* Fill 32-bit buffer size. */
+		litepcie_writel(s, dmachan->base + PCIE_DMA_WRITER_TABLE_VALUE_OFFSET + 4, DMA_BUFFER_SIZE);
+		/* Fill 32-bit Address LSB. */
+		litepcie_writel(s, dmachan->base + PCIE_DMA_WRITER_TABLE_VALUE_OFFSET + 8, (dmachan->writer_handle[i] >>  0) & 0xffffffff);
+#endif
 		/* Write descriptor (and fill 32-bit Address MSB for 64-bit mode). */
 		litepcie_writel(s, dmachan->base + PCIE_DMA_WRITER_TABLE_WE_OFFSET,        (dmachan->writer_handle[i] >> 32) & 0xffffffff);
 	}
@@ -247,6 +260,7 @@ static void litepcie_dma_reader_start(struct litepcie_device *s, int chan_num)
 	litepcie_writel(s, dmachan->base + PCIE_DMA_READER_TABLE_LOOP_PROG_N_OFFSET, 0);
 	for (i = 0; i < DMA_BUFFER_COUNT; i++) {
 		/* Fill buffer size + parameters. */
+#ifndef DMA_EXTENDED_DESCRIPTOR
 		litepcie_writel(s, dmachan->base + PCIE_DMA_READER_TABLE_VALUE_OFFSET,
 #ifndef DMA_BUFFER_ALIGNED
 			DMA_LAST_DISABLE |
@@ -255,6 +269,18 @@ static void litepcie_dma_reader_start(struct litepcie_device *s, int chan_num)
 			DMA_BUFFER_SIZE);                                  /* every n buffers */
 		/* Fill 32-bit Address LSB. */
 		litepcie_writel(s, dmachan->base + PCIE_DMA_READER_TABLE_VALUE_OFFSET + 4, (dmachan->reader_handle[i] >>  0) & 0xffffffff);
+#else
+		/* Fill parameters (Extended descriptor format). */
+		litepcie_writel(s, dmachan->base + PCIE_DMA_READER_TABLE_VALUE_OFFSET,
+#ifndef DMA_BUFFER_ALIGNED
+			DMA_LAST_DISABLE |
+#endif
+			(!(i%DMA_BUFFER_PER_IRQ == 0)) * DMA_IRQ_DISABLE); /* generate an msi every n buffers */
+		/* Fill 32-bit buffer size. */
+		litepcie_writel(s, dmachan->base + PCIE_DMA_READER_TABLE_VALUE_OFFSET + 4, DMA_BUFFER_SIZE);
+		/* Fill 32-bit Address LSB. */
+		litepcie_writel(s, dmachan->base + PCIE_DMA_READER_TABLE_VALUE_OFFSET + 8, (dmachan->reader_handle[i] >>  0) & 0xffffffff);
+#endif
 		/* Write descriptor (and fill 32-bit Address MSB for 64-bit mode). */
 		litepcie_writel(s, dmachan->base + PCIE_DMA_READER_TABLE_WE_OFFSET, (dmachan->reader_handle[i] >> 32) & 0xffffffff);
 	}
@@ -64,7 +64,9 @@ tlp_request_header_length = 16
 tlp_request_header_fields = {
     "fmt":          HeaderField(byte=0*4, offset=29, width= 2),
     "type":         HeaderField(byte=0*4, offset=24, width= 5),
+    "t9":           HeaderField(byte=0*4, offset=23, width= 1),
     "tc":           HeaderField(byte=0*4, offset=20, width= 3),
+    "t8":           HeaderField(byte=0*4, offset=19, width= 1),
     "td":           HeaderField(byte=0*4, offset=15, width= 1),
     "ep":           HeaderField(byte=0*4, offset=14, width= 1),
     "attr":         HeaderField(byte=0*4, offset=12, width= 2),
@@ -87,7 +89,9 @@ tlp_completion_header_length = 16
 tlp_completion_header_fields = {
     "fmt":           HeaderField(byte=0*4, offset=29, width= 2),
     "type":          HeaderField(byte=0*4, offset=24, width= 5),
+    "t9":            HeaderField(byte=0*4, offset=23, width= 1),
     "tc":            HeaderField(byte=0*4, offset=20, width= 3),
+    "t8":            HeaderField(byte=0*4, offset=19, width= 1),
     "td":            HeaderField(byte=0*4, offset=15, width= 1),
     "ep":            HeaderField(byte=0*4, offset=14, width= 1),
     "attr":          HeaderField(byte=0*4, offset=12, width= 2),
@@ -15,6 +15,11 @@ class LitePCIeTLPController(Module):
     """LitePCIe TLP requests/completions controller.
 
     Arbitrate/throttle TLP requests and reorder/assemble/redirect completions.
+
+    Up to 32 pending requests, the 5-bit Tags are used. Up to 256 pending requests, the 8-bit Tags
+    are used (Extended Tag Field has to be enabled on the PHY) and up to 512 pending requests, the
+    10-bit Tags are used (10-Bit Tag Requester has to be enabled on the PHY). 10-bit Tags are
+    allocated from 256 (Tags with T9/T8 = 00 are reserved to 8-bit Tags).
     """
     def __init__(self, data_width, address_width, max_pending_requests, cmp_bufs_buffered=True):
         self.master_in  = LitePCIeMasterInternalPort(data_width, address_width)
@@ -26,7 +31,9 @@ class LitePCIeTLPController(Module):
         cmp_sink, cmp_source = self.master_out.source, self.master_in.source
 
         # Parameters.
-        tag_bits = log2_int(max_pending_requests)
+        assert max_pending_requests <= 512
+        tag_bits   = log2_int(max_pending_requests)
+        tag_offset = 256 if max_pending_requests > 256 else 0
 
         # Tag queue --------------------------------------------------------------------------------
         # The tag queue is filled initially with the tags that will be used to issue read requests
@@ -47,16 +54,38 @@ class LitePCIeTLPController(Module):
         self.comb += req_sink.connect(req_source, omit={"valid", "ready", "tag"})
         self.submodules.req_fsm = req_fsm = FSM(reset_state="WAIT-REQ")
 
+        # Read Request Queuing: Pop Tag from tag_queue and Push Req to req_queue.
+        read_req_queue = [
+            tag_queue.source.ready.eq(1),
+            req_queue.sink.valid.eq(1),
+            req_queue.sink.tag.eq(tag_queue.source.tag),
+            req_sink.connect(req_queue.sink, keep={"channel", "user_id"}),
+        ]
+
         # FSM.
         req_fsm.act("WAIT-REQ",
-            # Wait for a TLP Request...
+            # Wait for a TLP Request... (Forwarded directly to allow back-to-back Requests).
             If(req_sink.valid & req_sink.first,
                 # TLP Write: We can send the request directly.
                 If(req_sink.we,
-                   NextState("SEND-WRITE-REQ")
+                    req_sink.connect(req_source, keep={"valid", "ready"}),
+                    req_source.tag.eq(32),
+                    # Continue Request in Send if not last.
+                    If(req_source.valid & req_source.ready & ~req_source.last,
+                        NextState("SEND-WRITE-REQ")
+                    )
                 # TLP Read:  We can send the request when one tag available and space in req_queue.
                 ).Elif(tag_queue.source.valid & req_queue.sink.ready,
-                   NextState("SEND-READ-REQ")
+                    req_sink.connect(req_source, keep={"valid", "ready"}),
+                    req_source.tag.eq(tag_queue.source.tag + tag_offset),
+                    If(req_source.valid & req_source.ready,
+                        If(req_source.last,
+                            *read_req_queue
+                        # Continue Request in Send if not last.
+                        ).Else(
+                            NextState("SEND-READ-REQ")
+                        )
+                    )
                 )
             )
         )
@@ -72,15 +101,10 @@ class LitePCIeTLPController(Module):
         req_fsm.act("SEND-READ-REQ",
             # Connect Control-Path.
             req_sink.connect(req_source, keep={"valid", "ready"}),
-            req_source.tag.eq(tag_queue.source.tag),
+            req_source.tag.eq(tag_queue.source.tag + tag_offset),
             # End Request and return to Wait on last valid cycle.
             If(req_source.valid & req_source.ready & req_source.last,
-                # Pop Tag from tag_queue.
-                tag_queue.source.ready.eq(1),
-                # Push Req to req_queue.
-                req_queue.sink.valid.eq(1),
-                req_queue.sink.tag.eq(tag_queue.source.tag),
-                req_sink.connect(req_queue.sink, keep={"channel", "user_id"}),
+                *read_req_queue,
                 NextState("WAIT-REQ")
             )
         )
@@ -107,7 +131,9 @@ class LitePCIeTLPController(Module):
         #
 
         cmp_reorder = stream.Endpoint(completion_layout(data_width))
+        cmp_index   = Signal(tag_bits)
         cmp_bufs    = []
+        self.comb += cmp_index.eq(cmp_reorder.tag - tag_offset)
 
         # Create Buffers.
         for i in range(max_pending_requests):
@@ -117,7 +143,7 @@ class LitePCIeTLPController(Module):
         self.submodules += cmp_bufs
 
         # Connect Cmp Input to Buffers (based on incoming Tag).
-        self.comb += Case(cmp_reorder.tag,
+        self.comb += Case(cmp_index,
             {i: cmp_reorder.connect(cmp_bufs[i].sink) for i in range(len(cmp_bufs))})
 
         # Connect Buffers to Cmp Output (based on Tag from req_ueue).
@@ -164,7 +190,7 @@ class LitePCIeTLPController(Module):
             If(cmp_sink.valid & cmp_sink.ready & cmp_sink.last,
                 If(cmp_sink.end,
                     tag_queue.sink.valid.eq(1),
-                    tag_queue.sink.tag.eq(cmp_sink.tag)
+                    tag_queue.sink.tag.eq(cmp_sink.tag - tag_offset)
                 ),
                 NextState("WAIT")
             )
@@ -49,13 +49,17 @@ class LitePCIeTLPHeaderExtracter64b(Module):
                 )
             )
         )
+        # Last sink beat with DWords remaining after the shift: an extra source beat is required.
+        carry = Signal()
+        self.comb += carry.eq(sink.be[4*1:] != 0)
         fsm.act("COPY",
             source.valid.eq(sink.valid | last),
             source.first.eq(first),
-            source.last.eq(sink.last | last),
+            source.last.eq((sink.last & ~carry) | last),
             If(source.valid & source.ready,
                 NextValue(first, 0),
                 sink.ready.eq(1 & ~last), # already acked when last is 1
+                If(sink.last & carry & ~last, NextValue(last, 1)),
                 If(source.last, NextState("IDLE"))
             )
         )
@@ -106,13 +110,19 @@ class LitePCIeTLPHeaderExtracter128b(Module):
                 NextState("COPY")
             )
         )
+        # Last sink beat with DWords remaining after the shift: an extra source beat is required.
+        carry = Signal()
+        self.comb += carry.eq(sink.be[4*3:] != 0)
         fsm.act("COPY",
             source.valid.eq(sink.valid | last),
             source.first.eq(first),
-            source.last.eq(sink.last | last),
+            source.last.eq((sink.last & ~carry) | last),
             If(source.valid & source.ready,
                 NextValue(first, 0),
                 sink.ready.eq(1 & ~last), # already acked when last is 1
+                If(sink.last & carry & ~last,
+                    NextValue(last, 1)
+                ),
                 If(source.last,
                     NextState("IDLE")
                 )
@@ -169,13 +179,19 @@ class LitePCIeTLPHeaderExtracter256b(Module):
                 NextState("COPY")
             )
         )
+        # Last sink beat with DWords remaining after the shift: an extra source beat is required.
+        carry = Signal()
+        self.comb += carry.eq(sink.be[4*3:] != 0)
         fsm.act("COPY",
             source.valid.eq(sink.valid | last),
             source.first.eq(first),
-            source.last.eq(sink.last | last),
+            source.last.eq((sink.last & ~carry) | last),
             If(source.valid & source.ready,
                 NextValue(first, 0),
                 sink.ready.eq(1 & ~last), # already acked when last is 1
+                If(sink.last & carry & ~last,
+                    NextValue(last, 1)
+                ),
                 If(source.last,
                     NextState("IDLE")
                 )
@@ -241,13 +257,19 @@ class LitePCIeTLPHeaderExtracter512b(Module):
                 NextState("COPY")
             )
         )
+        # Last sink beat with DWords remaining after the shift: an extra source beat is required.
+        carry = Signal()
+        self.comb += carry.eq(sink.be[4*3:] != 0)
         fsm.act("COPY",
             source.valid.eq(sink.valid | last),
             source.first.eq(first),
-            source.last.eq(sink.last | last),
+            source.last.eq((sink.last & ~carry) | last),
             If(source.valid & source.ready,
                 NextValue(first, 0),
                 sink.ready.eq(1 & ~last), # already acked when last is 1
+                If(sink.last & carry & ~last,
+                    NextValue(last, 1)
+                ),
                 If(source.last,
                     NextState("IDLE")
                 )
@@ -369,7 +391,9 @@ class LitePCIeTLPDepacketizer(Module):
             req_source.adr.eq(tlp_req.address & (~address_mask)),
             req_source.len.eq(tlp_req.length),
             req_source.req_id.eq(tlp_req.requester_id),
-            req_source.tag.eq(tlp_req.tag),
+            req_source.tag.eq(Cat(tlp_req.tag, tlp_req.t8, tlp_req.t9)),
+            req_source.first_be.eq(tlp_req.first_be),
+            req_source.last_be.eq(tlp_req.last_be),
             req_source.dat.eq(tlp_req.dat)
         ]
 
@@ -385,11 +409,12 @@ class LitePCIeTLPDepacketizer(Module):
             cmp_source.first.eq(tlp_cmp.first),
             cmp_source.last.eq(tlp_cmp.last),
             cmp_source.len.eq(tlp_cmp.length),
-            cmp_source.end.eq(tlp_cmp.length == (tlp_cmp.byte_count[2:])),
+            # Completion end when Length covers the remaining Byte Count (Byte-granular).
+            cmp_source.end.eq(tlp_cmp.length == ((tlp_cmp.byte_count + tlp_cmp.lower_address[:2] + 3)[2:])),
             cmp_source.adr.eq(tlp_cmp.lower_address),
             cmp_source.req_id.eq(tlp_cmp.requester_id),
             cmp_source.cmp_id.eq(tlp_cmp.completer_id),
             cmp_source.err.eq(tlp_cmp.status != 0),
-            cmp_source.tag.eq(tlp_cmp.tag),
+            cmp_source.tag.eq(Cat(tlp_cmp.tag, tlp_cmp.t8, tlp_cmp.t9)),
             cmp_source.dat.eq(tlp_cmp.dat)
         ]
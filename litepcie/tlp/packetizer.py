@@ -581,16 +581,31 @@ class LitePCIeTLPPacketizer(Module):
             tlp_req.length.eq(req_sink.len),
 
             tlp_req.requester_id.eq(req_sink.req_id),
-            tlp_req.tag.eq(req_sink.tag),
-            If(req_sink.len > 1,
-                tlp_req.last_be.eq(0xf)
+            tlp_req.tag.eq(req_sink.tag[0:8]),
+            tlp_req.t8.eq(req_sink.tag[8]),
+            tlp_req.t9.eq(req_sink.tag[9]),
+            # Byte Enables from Request (Byte-granular lengths).
+            If(req_sink.first_be != 0,
+                tlp_req.first_be.eq(req_sink.first_be),
+                tlp_req.last_be.eq(req_sink.last_be),
+            # Legacy: All bytes enabled.
             ).Else(
-                tlp_req.last_be.eq(0x0)
+                If(req_sink.len > 1,
+                    tlp_req.last_be.eq(0xf)
+                ).Else(
+                    tlp_req.last_be.eq(0x0)
+                ),
+                tlp_req.first_be.eq(0xf),
             ),
-            tlp_req.first_be.eq(0xf),
             tlp_req.dat.eq(req_sink.dat),
             If(req_sink.we,
-                tlp_req.be.eq(2**(data_width//8)-1)
+                tlp_req.be.eq(2**(data_width//8)-1),
+                # Only enable the Dwords of the Request on the last data-word.
+                If(req_sink.last,
+                    Case(req_sink.len[:log2_int(data_width//32)], {
+                        n: tlp_req.be.eq(2**(4*n)-1) for n in range(1, data_width//32)
+                    })
+                )
             ).Else(
                 tlp_req.be.eq(0x00)
             )
@@ -640,7 +655,9 @@ class LitePCIeTLPPacketizer(Module):
             tlp_cmp.byte_count.eq(cmp_sink.len*4),
 
             tlp_cmp.requester_id.eq(cmp_sink.req_id),
-            tlp_cmp.tag.eq(cmp_sink.tag),
+            tlp_cmp.tag.eq(cmp_sink.tag[0:8]),
+            tlp_cmp.t8.eq(cmp_sink.tag[8]),
+            tlp_cmp.t9.eq(cmp_sink.tag[9]),
             tlp_cmp.lower_address.eq(cmp_sink.adr),
 
             tlp_cmp.dat.eq(cmp_sink.dat),
@@ -106,14 +106,16 @@ class Chipset(Module):
     def cmp(self, req_id, data, byte_count=None, lower_address=0, tag=0, with_split=False):
         if with_split:
             d = random.choice([64, 128, 256])
-            n = byte_count//d
+            n = (4*len(data))//d
             if n == 0:
                 self.cmp(req_id, data, byte_count=byte_count, tag=tag)
             else:
                 for i in range(n):
-                    cmp_data = data[i*byte_count//(4*n):(i+1)*byte_count//(4*n)]
+                    start    = i*len(data)//n
+                    end      = (i+1)*len(data)//n
+                    cmp_data = data[start:end]
                     self.cmp(req_id, cmp_data,
-                        byte_count=byte_count-i*byte_count//n, tag=tag)
+                        byte_count=byte_count-4*start, tag=tag)
         else:
             if len(data) == 0:
                 fmt = 0b00
@@ -131,7 +133,9 @@ class Chipset(Module):
                 cpl.byte_count = len(data)*4
             else:
                 cpl.byte_count = byte_count
-            cpl.tag = tag
+            cpl.tag = (tag >> 0) & 0xff
+            cpl.t8  = (tag >> 8) & 0b1
+            cpl.t9  = (tag >> 9) & 0b1
             if len(data) == 0:
                 dwords = cpl.encode_dwords()
             else:
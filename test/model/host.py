@@ -26,9 +26,11 @@ class Host(Module):
         chipset_debug      = False,
         chipset_split      = False,
         chipset_reordering = False,
+        chipset_latency    = 0, # Cycles between a Read Request and its Completion(s).
         host_debug         = False):
-        self.debug         = host_debug
-        self.chipset_split = chipset_split
+        self.debug           = host_debug
+        self.chipset_split   = chipset_split
+        self.chipset_latency = chipset_latency
 
         # # #
 
@@ -37,17 +39,25 @@ class Host(Module):
         self.chipset.set_host_callback(self.callback)
 
         self.rd_queue = []
+        self.cycle    = 0
 
     def malloc(self, base, length):
         self.base   = base
         self.buffer = [0]*(length//4)
 
-    def write_mem(self, adr, data):
+    def write_mem(self, adr, data, first_be=0xf, last_be=0xf):
         if self.debug:
             print_host("Writing {} bytes @0x{:08x}".format(len(data)*4, adr))
         current_adr = (adr-self.base)//4
         for i in range(len(data)):
-            self.buffer[current_adr+i] = data[i]
+            # Byte Enables: First DWord uses first_be, Last DWord uses last_be (1 DWord: first_be only).
+            be = 0xf
+            if i == 0:
+                be &= first_be
+            if (i == len(data) - 1) and (len(data) > 1):
+                be &= last_be
+            mask = sum(0xff << (8*n) for n in range(4) if be & (1 << n))
+            self.buffer[current_adr+i] = (self.buffer[current_adr+i] & ~mask) | (data[i] & mask)
 
     def read_mem(self, adr, length=1):
         if self.debug:
@@ -60,25 +70,30 @@ class Host(Module):
 
     def callback(self, msg):
         if isinstance(msg, WR32):
-            self.write_mem(msg.address, msg.data)
+            self.write_mem(msg.address, msg.data, msg.first_be, msg.last_be)
         elif isinstance(msg, RD32):
-            self.rd_queue.append(msg)
+            self.rd_queue.append((self.cycle, msg))
         elif isinstance(msg, WR64):
-            self.write_mem(msg.address, msg.data)
+            self.write_mem(msg.address, msg.data, msg.first_be, msg.last_be)
         elif isinstance(msg, RD64):
-            self.rd_queue.append(msg)
+            self.rd_queue.append((self.cycle, msg))
 
     @passive
     def generator(self):
         while True:
-            if len(self.rd_queue):
-                msg     = self.rd_queue.pop(0)
+            if len(self.rd_queue) and (self.cycle >= self.rd_queue[0][0] + self.chipset_latency):
+                _, msg  = self.rd_queue.pop(0)
                 address = msg.address
                 length  = msg.length*4
                 data    = self.read_mem(address, length)
+                # Byte Count: Remove disabled leading/trailing Bytes.
+                first_be   = msg.first_be
+                last_be    = msg.last_be if msg.length > 1 else msg.first_be
+                byte_count = 4*(msg.length - 1) + last_be.bit_length() - ((first_be & -first_be).bit_length() - 1)
                 self.chipset.cmp(msg.requester_id, data,
-                    byte_count = length,
-                    tag        = msg.tag,
+                    byte_count = byte_count,
+                    tag        = (msg.t9 << 9) | (msg.t8 << 8) | msg.tag,
                     with_split = self.chipset_split
                 )
+            self.cycle += 1
             yield
@@ -131,7 +131,7 @@ class PHY(Module):
                     dat[n] = dat[n] << 32
                     be[n]  = be[n] << 4
                     try:
-                        dat[n] |= dwords[2*n+i]
+                        dat[n] |= dwords[ratio*n+i]
                         be[n]  |= 0xF
                     except:
                         pass
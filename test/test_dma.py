@@ -41,7 +41,9 @@ import unittest
 from litepcie.common import *
 from litepcie.core import LitePCIeEndpoint
 from litepcie.core.msi import LitePCIeMSI
-from litepcie.frontend.dma import LitePCIeDMAWriter, LitePCIeDMAReader
+from litepcie.frontend.dma import LitePCIeDMAWriter, LitePCIeDMAReader, LitePCIeDMAIRQModeration
+from litepcie.frontend.dma import LitePCIeDMADescriptorSplitter, LitePCIeDMAScatterGather
+from litepcie.frontend.dma import LitePCIeDMADescriptorDoorbell
 
 from test.common import seed_to_data
 from test.model.host import *
@@ -79,6 +81,31 @@ class DMADriver:
         yield from self.dma.table.value.write(value)
         yield from self.dma.table.we.write(address_msb)
 
+    def program_ring(self, address, size):
+        yield from self.dma.ring.address_lsb.write((address >>  0) & 0xffff_ffff)
+        yield from self.dma.ring.address_msb.write((address >> 32) & 0xffff_ffff)
+        yield from self.dma.ring.size.write(size)
+        yield from self.dma.ring.reset.write(1)
+
+    def ring_entry(self, address, length):
+        address_lsb = (address >>  0) & 0xffff_ffff
+        address_msb = (address >> 32) & 0xffff_ffff
+        return [address_lsb, length, address_msb, 0]
+
+    def ring_doorbell(self, head):
+        yield from self.dma.ring.head.write(head)
+
+    def ring_wait(self, tail):
+        while (yield self.dma.ring.tail.status) != tail:
+            yield
+
+    def program_writeback(self, address, size):
+        yield from self.dma.writeback.address_lsb.write((address >>  0) & 0xffff_ffff)
+        yield from self.dma.writeback.address_msb.write((address >> 32) & 0xffff_ffff)
+        yield from self.dma.writeback.size.write(size)
+        yield from self.dma.writeback.reset.write(1)
+        yield from self.dma.writeback.enable.write(1)
+
     def enable(self):
         yield from self.dma._enable.write(1)
 
@@ -136,13 +163,15 @@ class MSIHandler(Module):
 # Test DMA -----------------------------------------------------------------------------------------
 
 class TestDMA(unittest.TestCase):
-    def dma_test(self, data_width, address_width, test_size=1024):
-        host_data     = [seed_to_data(i, True) for i in range(test_size//4)]
-        loopback_data = []
+    def dma_test(self, data_width, address_width, test_size=1024, with_ring=False, with_writeback=False,
+        with_cut_through=False):
+        host_data      = [seed_to_data(i, True) for i in range(test_size//4)]
+        loopback_data  = []
+        writeback_data = {}
 
-        def main_generator(dut, nreads=8, nwrites=8):
+        def main_generator(dut, nreads=8, nwrites=8, ring_size=4):
             # Allocate Host's Memory.
-            dut.host.malloc(0x00000000, test_size*2)
+            dut.host.malloc(0x00000000, test_size*6)
 
             # Enable Chipset
             dut.host.chipset.enable()
@@ -154,17 +183,39 @@ class TestDMA(unittest.TestCase):
             dma_reader_driver = DMADriver("dma_reader", dut)
             dma_writer_driver = DMADriver("dma_writer", dut)
 
-            # Program DMA Reader descriptors.
-            yield from dma_reader_driver.set_prog_mode()
-            yield from dma_reader_driver.flush()
-            for i in range(nreads):
-                yield from dma_reader_driver.program_descriptor((test_size//8)*i, test_size//8)
-
-            # Program DMA Writer descriptors.
-            yield from dma_writer_driver.set_prog_mode()
-            yield from dma_writer_driver.flush()
-            for i in range(nwrites):
-                yield from dma_writer_driver.program_descriptor(test_size + (test_size//8)*i, test_size//8)
+            # Descriptors.
+            reader_descriptors = [((test_size//8)*i, test_size//8) for i in range(nreads)]
+            writer_descriptors = [(test_size + (test_size//8)*i, test_size//8) for i in range(nwrites)]
+
+            if with_ring:
+                # Program DMA Reader/Writer rings (Descriptors are written to the rings later).
+                reader_ring = 2*test_size
+                writer_ring = 3*test_size
+                yield from dma_reader_driver.program_ring(reader_ring, ring_size)
+                yield from dma_writer_driver.program_ring(writer_ring, ring_size)
+            else:
+                # Program DMA Reader descriptors.
+                yield from dma_reader_driver.set_prog_mode()
+                yield from dma_reader_driver.flush()
+                for address, length in reader_descriptors:
+                    yield from dma_reader_driver.program_descriptor(address, length)
+
+                # Program DMA Writer descriptors.
+                yield from dma_writer_driver.set_prog_mode()
+                yield from dma_writer_driver.flush()
+                for address, length in writer_descriptors:
+                    yield from dma_writer_driver.program_descriptor(address, length)
+
+            if with_writeback:
+                # Program DMA Reader/Writer writeback rings.
+                reader_writeback = 4*test_size
+                writer_writeback = 5*test_size
+                yield from dma_reader_driver.program_writeback(reader_writeback, 16)
+                yield from dma_writer_driver.program_writeback(writer_writeback, 16)
+
+            if with_cut_through:
+                # Enable DMA Writer Cut-Through (Start Write Requests with 4 data-words buffered).
+                yield from dut.dma_writer.cut_through.write((4 << 16) | 0b1)
 
             # Enable MSI.
             yield dut.msi.enable.storage.eq(DMA_READER_IRQ | DMA_WRITER_IRQ)
@@ -173,6 +224,23 @@ class TestDMA(unittest.TestCase):
             yield from dma_reader_driver.enable()
             yield from dma_writer_driver.enable()
 
+            if with_ring:
+                # Write descriptors to the rings by batches of ring_size - 1 (to also test the ring
+                # wrapping) and ring doorbells.
+                head = 0
+                for n in range(0, nreads, ring_size - 1):
+                    for driver, ring, descriptors in [
+                        (dma_writer_driver, writer_ring, writer_descriptors),
+                        (dma_reader_driver, reader_ring, reader_descriptors)]:
+                        for i, (address, length) in enumerate(descriptors[n:n + ring_size - 1]):
+                            entry = driver.ring_entry(address, length)
+                            dut.host.write_mem(ring + 16*((head + i)%ring_size), entry)
+                    head = (head + len(reader_descriptors[n:n + ring_size - 1]))%ring_size
+                    yield from dma_writer_driver.ring_doorbell(head)
+                    yield from dma_reader_driver.ring_doorbell(head)
+                    yield from dma_writer_driver.ring_wait(head)
+                    yield from dma_reader_driver.ring_wait(head)
+
             # Wait for all writes.
             while dut.msi_handler.dma_writer_irq_count != nwrites:
                 yield
@@ -184,9 +252,13 @@ class TestDMA(unittest.TestCase):
             for data in dut.host.read_mem(test_size, test_size):
                 loopback_data.append(data)
 
+            if with_writeback:
+                writeback_data["reader"] = dut.host.read_mem(reader_writeback, 16*nreads)
+                writeback_data["writer"] = dut.host.read_mem(writer_writeback, 16*nwrites)
+
 
         class DUT(Module):
-            def __init__(self, data_width, address_width):
+            def __init__(self, data_width, address_width, with_ring, with_writeback, with_cut_through):
                 self.data_width    = data_width
                 self.address_width = address_width
 
@@ -201,14 +273,23 @@ class TestDMA(unittest.TestCase):
                 # Endpoint -------------------------------------------------------------------------
                 self.submodules.endpoint = LitePCIeEndpoint(self.host.phy,
                     address_width        = address_width,
+                    endianness           = "little", # Host model's memory is seen as little-endian.
                     max_pending_requests = 8
                 )
 
                 # DMA Reader/Writer ----------------------------------------------------------------
                 dma_reader_port = self.endpoint.crossbar.get_master_port(read_only=True)
                 dma_writer_port = self.endpoint.crossbar.get_master_port(write_only=True)
-                self.submodules.dma_reader = LitePCIeDMAReader(self.endpoint, dma_reader_port, address_width=address_width)
-                self.submodules.dma_writer = LitePCIeDMAWriter(self.endpoint, dma_writer_port, address_width=address_width)
+                self.submodules.dma_reader = LitePCIeDMAReader(self.endpoint, dma_reader_port,
+                    address_width    = address_width,
+                    with_ring        = with_ring,
+                    with_writeback   = with_writeback)
+                self.submodules.dma_writer = LitePCIeDMAWriter(self.endpoint, dma_writer_port,
+                    address_width    = address_width,
+                    with_ring        = with_ring,
+                    with_writeback   = with_writeback,
+                    with_cut_through = with_cut_through,
+                    data_fifo_depth  = (max_payload_size//(data_width//8)) if with_cut_through else None)
                 self.comb += self.dma_reader.source.connect(self.dma_writer.sink)
 
                 # MSI ------------------------------------------------------------------------------
@@ -220,7 +301,7 @@ class TestDMA(unittest.TestCase):
                 self.submodules.msi_handler = MSIHandler(debug=False)
                 self.comb += self.msi.source.connect(self.msi_handler.sink)
 
-        dut = DUT(data_width, address_width)
+        dut = DUT(data_width, address_width, with_ring, with_writeback, with_cut_through)
         generators = {
             "sys" : [
                 main_generator(dut),
@@ -234,9 +315,545 @@ class TestDMA(unittest.TestCase):
         clocks = {"sys": 10}
         run_simulation(dut, generators, clocks, vcd_name="test_dma.vcd")
         self.assertEqual(host_data, loopback_data)
+        if with_writeback:
+            # Records: Sequence Number (LSB/MSB), Byte Count, Flags (IRQ).
+            for name in ["reader", "writer"]:
+                records = [writeback_data[name][4*i:4*(i+1)] for i in range(8)]
+                self.assertEqual(records, [[i + 1, 0, test_size//8, 0b01] for i in range(8)])
 
     def test_dma_64b_data_width_32b_address_width(self):
         self.dma_test(data_width=64, address_width=32)
 
     def test_dma_64b_data_width_64b_address_width(self):
-        self.dma_test(data_width=64, address_width=64)
\ No newline at end of file
+        self.dma_test(data_width=64, address_width=64)
+
+    def test_dma_64b_data_width_32b_address_width_ring(self):
+        self.dma_test(data_width=64, address_width=32, with_ring=True)
+
+    def test_dma_64b_data_width_32b_address_width_writeback(self):
+        self.dma_test(data_width=64, address_width=32, with_writeback=True)
+
+    def test_dma_64b_data_width_32b_address_width_cut_through(self):
+        self.dma_test(data_width=64, address_width=32, with_cut_through=True)
+
+    def test_dma_irq_moderation(self):
+        irqs = []
+
+        def irq_generator(dut, intervals):
+            for interval in intervals:
+                yield dut.irq_in.eq(1)
+                yield
+                yield dut.irq_in.eq(0)
+                for i in range(interval - 1):
+                    yield
+
+        @passive
+        def irq_monitor(dut):
+            cycle = 0
+            while True:
+                if (yield dut.irq):
+                    irqs.append(cycle)
+                cycle += 1
+                yield
+
+        def main_generator(dut):
+            # Count Mode: Fire after 4 IRQs.
+            yield from dut.control.write(0b1)
+            yield from dut.count.write(4)
+            irqs.clear()
+            yield from irq_generator(dut, [3]*12)
+            self.assertEqual(len(irqs), 3)
+
+            # Timeout Mode: Fire 5µs (50 cycles) after the first pending IRQ.
+            yield from dut.count.write(100)
+            yield from dut.timeout.write(5)
+            irqs.clear()
+            yield from irq_generator(dut, [200])
+            self.assertEqual(len(irqs), 1)
+
+            # Adaptive Mode: N increases with the IRQ rate.
+            yield from dut.count.write(1)
+            yield from dut.count_max.write(8)
+            yield from dut.timeout.write(10)
+            yield from dut.control.write((1 << 4) | 0b11)
+            self.assertEqual((yield dut.status.status), 1)
+            yield from irq_generator(dut, [1]*200)
+            self.assertEqual((yield dut.status.status), 8)
+            irqs.clear()
+            yield from irq_generator(dut, [1]*800)
+            self.assertLessEqual(len(irqs), 800//8 + 1)
+
+        class DUT(LitePCIeDMAIRQModeration):
+            def __init__(self):
+                self.irq_in = Signal()
+                LitePCIeDMAIRQModeration.__init__(self, self.irq_in, sys_clk_freq=10e6)
+
+        dut = DUT()
+        run_simulation(dut, [main_generator(dut), irq_monitor(dut)])
+
+    def test_dma_reader_ramp_up(self, data_width=128, max_pending_requests=8):
+        ramp_up = {}
+
+        def main_generator(dut):
+            # Allocate/Fill Host's Memory.
+            dut.host.malloc(0x00000000, 8192)
+            dut.host.chipset.enable()
+            dut.host.write_mem(0x00000000, [seed_to_data(i, True) for i in range(8192//4)])
+
+            # Program a Descriptor covering 2*max_pending_requests Read Requests and enable Reader.
+            dma_reader_driver = DMADriver("dma_reader", dut)
+            yield from dma_reader_driver.set_prog_mode()
+            yield from dma_reader_driver.flush()
+            yield from dma_reader_driver.program_descriptor(0x00000000, 2*max_pending_requests*512)
+            yield from dma_reader_driver.enable()
+
+            # Measure Ramp-up time to max_pending_requests outstanding Read Requests.
+            port        = dut.dma_reader.port
+            cycle       = 0
+            outstanding = 0
+            while outstanding < max_pending_requests:
+                if (yield port.source.valid) and (yield port.source.ready):
+                    if outstanding == 0:
+                        ramp_up["start"] = cycle
+                    outstanding += 1
+                if (yield port.sink.valid) and (yield port.sink.ready) and (yield port.sink.last) and (yield port.sink.end):
+                    outstanding -= 1
+                cycle += 1
+                yield
+            ramp_up["end"] = cycle
+
+        class DUT(Module):
+            def __init__(self):
+                self.submodules.host = Host(data_width, root_id, endpoint_id,
+                    phy_debug          = False,
+                    chipset_debug      = False,
+                    chipset_split      = True,
+                    chipset_reordering = False,
+                    host_debug         = False)
+                self.submodules.endpoint = LitePCIeEndpoint(self.host.phy,
+                    max_pending_requests = max_pending_requests
+                )
+                dma_reader_port = self.endpoint.crossbar.get_master_port(read_only=True)
+                self.submodules.dma_reader = LitePCIeDMAReader(self.endpoint, dma_reader_port)
+                self.comb += self.dma_reader.source.ready.eq(1)
+
+        dut = DUT()
+        generators = {
+            "sys" : [
+                main_generator(dut),
+                dut.host.generator(),
+                dut.host.chipset.generator(),
+                dut.host.phy.phy_sink.generator(),
+                dut.host.phy.phy_source.generator()
+            ]
+        }
+        clocks = {"sys": 10}
+        run_simulation(dut, generators, clocks)
+        cycles = ramp_up["end"] - ramp_up["start"]
+        print("Ramp-up to {} outstanding Read Requests: {} cycles.".format(max_pending_requests, cycles))
+        # Requests are issued back-to-back.
+        self.assertLessEqual(cycles, max_pending_requests + 2)
+
+    def test_dma_reader_extended_tags(self, data_width=128, max_pending_requests=64, latency=256):
+        test_size = 32*KB
+        results   = {"tags": set()}
+
+        def main_generator(dut):
+            # Allocate/Fill Host's Memory.
+            dut.host.malloc(0x00000000, test_size)
+            dut.host.chipset.enable()
+            dut.host.write_mem(0x00000000, [seed_to_data(i, True) for i in range(test_size//4)])
+
+            # Program a Descriptor and enable Reader.
+            dma_reader_driver = DMADriver("dma_reader", dut)
+            yield from dma_reader_driver.set_prog_mode()
+            yield from dma_reader_driver.flush()
+            yield from dma_reader_driver.program_descriptor(0x00000000, test_size)
+            yield from dma_reader_driver.enable()
+
+            # Measure Read throughput (from first to last data-word) and collect the Tags used.
+            req    = dut.endpoint.crossbar.controller.master_out.sink
+            source = dut.dma_reader.source
+            cycle  = 0
+            words  = 0
+            while words < test_size//(data_width//8):
+                if (yield req.valid) and (yield req.ready) and (yield req.first) and not (yield req.we):
+                    results["tags"].add((yield req.tag))
+                if (yield source.valid) and (yield source.ready):
+                    if words == 0:
+                        results["start"] = cycle
+                    words += 1
+                cycle += 1
+                yield
+            results["end"] = cycle
+
+        class DUT(Module):
+            def __init__(self):
+                self.submodules.host = Host(data_width, root_id, endpoint_id,
+                    phy_debug          = False,
+                    chipset_debug      = False,
+                    chipset_split      = False,
+                    chipset_reordering = False,
+                    chipset_latency    = latency,
+                    host_debug         = False)
+                self.submodules.endpoint = LitePCIeEndpoint(self.host.phy,
+                    max_pending_requests = max_pending_requests
+                )
+                dma_reader_port = self.endpoint.crossbar.get_master_port(read_only=True)
+                self.submodules.dma_reader = LitePCIeDMAReader(self.endpoint, dma_reader_port)
+                self.comb += self.dma_reader.source.ready.eq(1)
+
+        dut = DUT()
+        generators = {
+            "sys" : [
+                main_generator(dut),
+                dut.host.generator(),
+                dut.host.chipset.generator(),
+                dut.host.phy.phy_sink.generator(),
+                dut.host.phy.phy_source.generator()
+            ]
+        }
+        clocks = {"sys": 10}
+        run_simulation(dut, generators, clocks)
+        words_per_cycle = (test_size//(data_width//8))/(results["end"] - results["start"])
+        print("Read throughput with {} Tags and {} cycles of latency: {:.2f} data-words/cycle.".format(
+            max_pending_requests, latency, words_per_cycle))
+        # Extended Tags are used and the latency is covered (The Host model inserts idle cycles
+        # between Completions, limiting the throughput to ~0.95 data-words/cycle).
+        self.assertGreater(max(results["tags"]), 32)
+        self.assertGreaterEqual(words_per_cycle, 0.85)
+
+    def test_dma_descriptor_splitter(self, max_size=512):
+        descriptors = [
+            # Address,    Length.
+            (0x0000_0000, 0x0000_0400), # Aligned.
+            (0x0000_0fc0, 0x0000_0300), # Unaligned, crossing a 4KB boundary.
+            (0x0000_1f00, 0x0000_0080), # Unaligned, shorter than head split.
+            (0x0001_2340, 0x0000_1000), # Unaligned, long.
+        ]
+        splits = []
+
+        def descriptor_generator(dut):
+            for address, length in descriptors:
+                yield dut.sink.valid.eq(1)
+                yield dut.sink.address.eq(address)
+                yield dut.sink.length.eq(length)
+                yield
+                while not (yield dut.sink.ready):
+                    yield
+            yield dut.sink.valid.eq(0)
+
+        @passive
+        def split_checker(dut):
+            yield dut.source.ready.eq(1)
+            while True:
+                if (yield dut.source.valid):
+                    splits.append(((yield dut.source.address), (yield dut.source.length), (yield dut.source.last)))
+                yield
+
+        dut = LitePCIeDMADescriptorSplitter(max_size=max_size, address_width=32)
+        run_simulation(dut, [descriptor_generator(dut), split_checker(dut)])
+
+        # Check Splits: Descriptors fully covered, splits aligned on max_size, never crossing 4KB.
+        n = 0
+        for address, length in descriptors:
+            offset = 0
+            while offset < length:
+                split_address, split_length, split_last = splits[n]
+                self.assertEqual(split_address, address + offset)
+                self.assertLessEqual(split_length, max_size - (split_address % max_size))
+                self.assertEqual(split_address//4096, (split_address + split_length - 1)//4096)
+                offset += split_length
+                n += 1
+            self.assertEqual(offset, length)
+            self.assertEqual(split_last, 1)
+        self.assertEqual(n, len(splits))
+        self.assertEqual(splits[2][:2], (0x0000_0fc0, 0x0000_0040))
+
+    def test_dma_scatter_gather_extended(self, depth=4096):
+        descriptors = [
+            # Address,    Length,      IRQ Disable.
+            (0x0000_1000, 0x0100_0000, 0), # > 24-bit.
+            (0x0000_2000, 0xffff_fff0, 1),
+            (0x0000_3000, 0x0000_0040, 0),
+        ]
+        received = []
+        status   = []
+
+        def main_generator(dut):
+            # Program the Table in Prog mode (Extended descriptor format).
+            yield from dut.loop_prog_n.write(0)
+            yield from dut.reset.write(1)
+            for address, length, irq_disable in descriptors:
+                yield from dut.value.write((irq_disable << 64) | (length << 32) | address)
+                yield from dut.we.write(0)
+            for i in range(4):
+                yield
+            self.assertEqual((yield dut.level.status), len(descriptors))
+
+            # Switch to Loop mode and execute the Table twice.
+            yield from dut.loop_prog_n.write(1)
+            yield dut.source.ready.eq(1)
+            yield
+            while len(received) < 2*len(descriptors):
+                if (yield dut.source.valid) and (yield dut.source.ready):
+                    received.append((
+                        (yield dut.source.address),
+                        (yield dut.source.length),
+                        (yield dut.source.irq_disable)))
+                yield
+            status.append(((yield dut.loop_status.fields.index), (yield dut.loop_status.fields.count)))
+
+        dut = LitePCIeDMAScatterGather(depth, length_width=32)
+        run_simulation(dut, main_generator(dut))
+
+        # Check Descriptors and Loop Status (index: 2, count: 1; 16-bit index is enough for 64K
+        # descriptors).
+        self.assertEqual(received, 2*descriptors)
+        self.assertEqual(len(dut.loop_status.status), 32)
+        self.assertEqual(status, [(2, 1)])
+
+    def test_dma_descriptor_doorbell(self, data_width=128):
+        descriptors = [
+            # Address,    Length,      IRQ Disable.
+            (0x0000_1000, 0x0000_2000, 0),
+            (0x0000_3000, 0x0000_0400, 1),
+            (0x0000_5000, 0x0000_0800, 0),
+            (0x0000_7000, 0x0000_0100, 1), # Submitted with a 64-bit write.
+        ]
+        received = []
+        rd_data  = []
+
+        def entry(address, length, irq_disable):
+            return [address, (irq_disable << 24) | length, 0, 0]
+
+        def main_generator(dut):
+            yield from dut.table.loop_prog_n.write(0)
+            yield from dut.table.reset.write(1)
+
+            # Submit 3 descriptors with a single burst Write, then 1 with a 64-bit Write.
+            burst = []
+            for desc in descriptors[:3]:
+                burst += entry(*desc)
+            yield from dut.host.chipset.wr32(0, burst)
+            yield from dut.host.chipset.wr32(0, entry(*descriptors[3])[:2])
+
+            # Reads of the window are completed.
+            yield from dut.host.chipset.rd32(0)
+            rd_data.extend(dut.host.chipset.rd_data)
+
+            # Get descriptors from the table.
+            yield dut.table.source.ready.eq(1)
+            yield
+            for i in range(16):
+                if (yield dut.table.source.valid) and (yield dut.table.source.ready):
+                    received.append((
+                        (yield dut.table.source.address),
+                        (yield dut.table.source.length),
+                        (yield dut.table.source.irq_disable)))
+                yield
+
+        class DUT(Module):
+            def __init__(self):
+                self.submodules.host     = Host(data_width, root_id, endpoint_id)
+                self.submodules.endpoint = LitePCIeEndpoint(self.host.phy, endianness="little")
+                self.submodules.table    = LitePCIeDMAScatterGather(16, with_sink=True)
+                self.submodules.doorbell = LitePCIeDMADescriptorDoorbell(self.endpoint,
+                    address_decoder = lambda a: 1)
+                self.comb += self.doorbell.source.connect(self.table.sink)
+
+        dut = DUT()
+        generators = {
+            "sys" : [
+                main_generator(dut),
+                dut.host.chipset.phy.phy_sink.generator(),
+                dut.host.chipset.phy.phy_source.generator(),
+            ]
+        }
+        clocks = {"sys": 10}
+        run_simulation(dut, generators, clocks)
+        self.assertEqual(received, descriptors)
+        self.assertEqual(rd_data, [0])
+
+    def test_dma_writer_early_termination(self, data_width=64):
+        packets     = [20, 40, 5, 64, 16] # In data-words.
+        desc_length = 512                 # In bytes.
+        desc_base   = 0x1000
+        host_data   = []
+        irqs        = []
+
+        def packet_generator(dut):
+            n = 0
+            for length in packets:
+                for i in range(length):
+                    yield dut.dma_writer.sink.valid.eq(1)
+                    yield dut.dma_writer.sink.last.eq(i == (length - 1))
+                    yield dut.dma_writer.sink.data.eq(((2*n + 1) << 32) | (2*n))
+                    n += 1
+                    yield
+                    while not (yield dut.dma_writer.sink.ready):
+                        yield
+            yield dut.dma_writer.sink.valid.eq(0)
+
+        @passive
+        def irq_monitor(dut):
+            while True:
+                if (yield dut.dma_writer.irq):
+                    irqs.append(1)
+                yield
+
+        def main_generator(dut):
+            # Allocate Host's Memory.
+            dut.host.malloc(0x00000000, desc_base + len(packets)*desc_length)
+            dut.host.chipset.enable()
+
+            # Program DMA Writer descriptors (Packets are shorter than/equal to the descriptors).
+            dma_writer_driver = DMADriver("dma_writer", dut)
+            yield from dma_writer_driver.set_prog_mode()
+            yield from dma_writer_driver.flush()
+            for i in range(len(packets)):
+                yield from dma_writer_driver.program_descriptor(desc_base + i*desc_length, desc_length)
+            yield from dma_writer_driver.enable()
+
+            # Send Packets and wait for all Descriptors to be executed.
+            yield from packet_generator(dut)
+            while len(irqs) != len(packets):
+                yield
+            for i in range(1024):
+                yield
+
+            for i in range(len(packets)):
+                host_data.append(dut.host.read_mem(desc_base + i*desc_length, desc_length))
+
+        class DUT(Module):
+            def __init__(self):
+                self.submodules.host = Host(data_width, root_id, endpoint_id,
+                    phy_debug          = False,
+                    chipset_debug      = False,
+                    chipset_split      = True,
+                    chipset_reordering = False,
+                    host_debug         = False)
+                self.submodules.endpoint = LitePCIeEndpoint(self.host.phy,
+                    endianness           = "little",
+                    max_pending_requests = 8
+                )
+                dma_writer_port = self.endpoint.crossbar.get_master_port(write_only=True)
+                self.submodules.dma_writer = LitePCIeDMAWriter(self.endpoint, dma_writer_port)
+
+        dut = DUT()
+        generators = {
+            "sys" : [
+                main_generator(dut),
+                irq_monitor(dut),
+                dut.host.generator(),
+                dut.host.chipset.generator(),
+                dut.host.phy.phy_sink.generator(),
+                dut.host.phy.phy_source.generator()
+            ]
+        }
+        clocks = {"sys": 10}
+        run_simulation(dut, generators, clocks)
+
+        # Check that each Packet has been written to its Descriptor and that the splits following
+        # the early termination have been discarded.
+        dwords_per_word  = data_width//32
+        words_per_split  = max_payload_size//(data_width//8)
+        dword = 0
+        for length, data in zip(packets, host_data):
+            written = dwords_per_word*words_per_split*((length + words_per_split - 1)//words_per_split)
+            self.assertEqual(data[:dwords_per_word*length], list(range(dword, dword + dwords_per_word*length)))
+            self.assertEqual(data[written:], [0]*(len(data) - written))
+            dword += dwords_per_word*length
+
+    def test_dma_byte_granular_lengths(self, data_width=64):
+        lengths     = [125, 3, 130, 4, 256, 7] # In bytes.
+        src_base    = 0x0000
+        dst_base    = 0x1000
+        wb_base     = 0x2000
+        desc_stride = 0x200
+        background  = 0xa5a5_a5a5
+        host_data   = [seed_to_data(i, True) for i in range(len(lengths)*desc_stride//4)]
+        dst_data    = []
+        wb_data     = []
+        irqs        = []
+
+        @passive
+        def irq_monitor(dut):
+            while True:
+                if (yield dut.dma_writer.irq):
+                    irqs.append(1)
+                yield
+
+        def main_generator(dut):
+            # Allocate/Fill Host's Memory (Destination is filled with a background pattern).
+            dut.host.malloc(0x00000000, 3*0x1000)
+            dut.host.chipset.enable()
+            dut.host.write_mem(src_base, host_data)
+            dut.host.write_mem(dst_base, [background]*(len(lengths)*desc_stride//4))
+
+            # Program DMA Reader/Writer descriptors/writebacks.
+            dma_reader_driver = DMADriver("dma_reader", dut)
+            dma_writer_driver = DMADriver("dma_writer", dut)
+            for driver, base in [(dma_reader_driver, src_base), (dma_writer_driver, dst_base)]:
+                yield from driver.set_prog_mode()
+                yield from driver.flush()
+                for i, length in enumerate(lengths):
+                    yield from driver.program_descriptor(base + i*desc_stride, length)
+            yield from dma_writer_driver.program_writeback(wb_base, 16)
+            yield from dma_reader_driver.enable()
+            yield from dma_writer_driver.enable()
+
+            # Wait for all writes (Short Descriptors IRQs are too close to be counted through MSIs).
+            while len(irqs) != len(lengths):
+                yield
+            for i in range(1024):
+                yield
+
+            for i in range(len(lengths)):
+                dst_data.append(dut.host.read_mem(dst_base + i*desc_stride, desc_stride))
+            wb_data.extend(dut.host.read_mem(wb_base, 16*len(lengths)))
+
+        class DUT(Module):
+            def __init__(self):
+                self.submodules.host = Host(data_width, root_id, endpoint_id,
+                    phy_debug          = False,
+                    chipset_debug      = False,
+                    chipset_split      = True,
+                    chipset_reordering = True,
+                    host_debug         = False)
+                self.submodules.endpoint = LitePCIeEndpoint(self.host.phy,
+                    endianness           = "little",
+                    max_pending_requests = 8
+                )
+                dma_reader_port = self.endpoint.crossbar.get_master_port(read_only=True)
+                dma_writer_port = self.endpoint.crossbar.get_master_port(write_only=True)
+                self.submodules.dma_reader = LitePCIeDMAReader(self.endpoint, dma_reader_port)
+                self.submodules.dma_writer = LitePCIeDMAWriter(self.endpoint, dma_writer_port,
+                    with_writeback = True)
+                self.comb += self.dma_reader.source.connect(self.dma_writer.sink)
+
+        dut = DUT()
+        generators = {
+            "sys" : [
+                main_generator(dut),
+                irq_monitor(dut),
+                dut.host.generator(),
+                dut.host.chipset.generator(),
+                dut.host.phy.phy_sink.generator(),
+                dut.host.phy.phy_source.generator()
+            ]
+        }
+        clocks = {"sys": 10}
+        run_simulation(dut, generators, clocks)
+
+        # Check that exactly length bytes have been written to each Descriptor (Host's DWords are
+        # little-endian) and that the Writer reports the byte-granular lengths.
+        def to_bytes(dwords):
+            return b"".join(dword.to_bytes(4, "little") for dword in dwords)
+        for i, (length, data) in enumerate(zip(lengths, dst_data)):
+            src = to_bytes(host_data[i*desc_stride//4:(i+1)*desc_stride//4])
+            dst = to_bytes(data)
+            self.assertEqual(dst[:length], src[:length])
+            self.assertEqual(dst[length:], to_bytes([background]*(desc_stride//4))[length:])
+        records = [wb_data[4*i:4*(i+1)] for i in range(len(lengths))]
+        self.assertEqual(records, [[i + 1, 0, length, 0b01] for i, length in enumerate(lengths)])